@@ -1,6 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi_utils.tasks import repeat_every
 from src.routes import auth, customers, partners, bookings, reviews, notifications
+from src.database.session import SessionLocal
+from src.utils.holds import sweep_expired_holds
+from src.utils.free_intervals import rebuild_all_free_intervals
+from src.utils.notification import dispatch_due_notifications
+from src.utils.lifecycle import run_booking_lifecycle
+from src.utils.catalog import refresh_partner_catalog
+from src.config.settings import settings
 import os
 import uvicorn
 
@@ -32,6 +40,59 @@ app.include_router(bookings.router)
 app.include_router(reviews.router)
 app.include_router(notifications.router)
 
+@app.on_event("startup")
+@repeat_every(seconds=settings.PARTNER_CATALOG_POLL_SECONDS)
+def refresh_catalog() -> None:
+    """Load the partner catalog, and reload it when partners changed in another process"""
+    db = SessionLocal()
+    try:
+        refresh_partner_catalog(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+@repeat_every(seconds=60)
+def sweep_slot_holds() -> None:
+    """Delete slot holds that expired without becoming a booking"""
+    db = SessionLocal()
+    try:
+        sweep_expired_holds(db)
+        db.commit()
+    finally:
+        db.close()
+
+@app.on_event("startup")
+@repeat_every(seconds=settings.FREE_INTERVAL_REBUILD_SECONDS)
+def roll_free_intervals() -> None:
+    """Roll partner free intervals forward to the horizon"""
+    db = SessionLocal()
+    try:
+        rebuild_all_free_intervals(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+@repeat_every(seconds=settings.NOTIFICATION_DISPATCH_SECONDS)
+def dispatch_notifications() -> None:
+    """Deliver due notifications from the outbox, batch by batch"""
+    db = SessionLocal()
+    try:
+        while dispatch_due_notifications(db) == settings.NOTIFICATION_DISPATCH_BATCH:
+            db.commit()
+        db.commit()
+    finally:
+        db.close()
+
+@app.on_event("startup")
+@repeat_every(seconds=settings.BOOKING_LIFECYCLE_SECONDS)
+def complete_bookings() -> None:
+    """Move bookings that have ended to completed"""
+    db = SessionLocal()
+    try:
+        run_booking_lifecycle(db)
+    finally:
+        db.close()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Service Booking API"}
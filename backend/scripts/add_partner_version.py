@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, text
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from src.config.settings import settings
+
+def add_partner_version():
+    """
+    Add the partners.version column to a database created before it existed.
+    New databases get it from Base.metadata.create_all.
+    """
+    engine = create_engine(settings.DATABASE_URL)
+
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(
+                "ALTER TABLE partners ADD COLUMN IF NOT EXISTS "
+                "version integer NOT NULL DEFAULT 1"
+            ))
+        print("Partner version column is in place.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+if __name__ == "__main__":
+    add_partner_version()
@@ -0,0 +1,34 @@
+from sqlalchemy import create_engine, text
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from src.models.booking import Booking, BOOKING_OVERLAP_DDL
+from src.config.settings import settings
+
+def apply_booking_constraints():
+    """
+    Add the booking overlap constraint and indexes to a database created
+    before they existed. New databases get them from Base.metadata.create_all.
+    """
+    engine = create_engine(settings.DATABASE_URL)
+
+    try:
+        with engine.begin() as connection:
+            for ddl in BOOKING_OVERLAP_DDL:
+                connection.execute(ddl)
+            # Replaced by ix_bookings_partner_live, whose predicate the
+            # conflict queries can use
+            connection.execute(text("DROP INDEX IF EXISTS ix_bookings_partner_active"))
+            for index in Booking.__table__.indexes:
+                index.create(connection, checkfirst=True)
+        print("Booking overlap constraint and indexes are in place.")
+    except Exception as e:
+        # Usually existing bookings that already overlap
+        print(f"An error occurred: {e}")
+
+if __name__ == "__main__":
+    apply_booking_constraints()
@@ -0,0 +1,122 @@
+"""
+Compare database round trips of a booking availability check before and
+after the unified conflict checker.
+
+"legacy" replays the queries validate_partner_availability and
+ScheduleService.check_partner_availability used to run. "unified" is
+check_partner_conflicts. Runs against an in-memory SQLite database.
+
+    python scripts/benchmark_conflicts.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+for key in ("DATABASE_URL", "JWT_SECRET", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(key, "benchmark")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from src.models import Base, Partner, Customer, Booking
+from src.schemas.booking import BookingStatus, BookingType
+from src.schemas.enums import PartnerRole
+from src.utils.conflicts import check_partner_conflicts
+
+NUM_PARTNERS = 50
+BOOKINGS_PER_PARTNER = 40
+NUM_CHECKS = 500
+
+def legacy_check(db: Session, partner_id: int, start: datetime, end: datetime) -> bool:
+    partner = db.query(Partner).filter(
+        Partner.id == partner_id,
+        Partner.is_available == True
+    ).first()
+    if not partner:
+        return False
+    active = [BookingStatus.CONFIRMED, BookingStatus.PENDING]
+    if db.query(Booking).filter(
+        Booking.partner_id == partner_id,
+        Booking.status.in_(active),
+        ~((Booking.end_datetime <= start) | (Booking.start_datetime >= end))
+    ).first():
+        return False
+    prev_booking = db.query(Booking).filter(
+        Booking.partner_id == partner_id,
+        Booking.status != BookingStatus.CANCELLED,
+        Booking.end_datetime <= start
+    ).order_by(Booking.end_datetime.desc()).first()
+    next_booking = db.query(Booking).filter(
+        Booking.partner_id == partner_id,
+        Booking.status != BookingStatus.CANCELLED,
+        Booking.start_datetime >= end
+    ).order_by(Booking.start_datetime.asc()).first()
+    # ScheduleService.check_partner_availability, used by matching
+    db.query(Booking).filter(
+        Booking.partner_id == partner_id,
+        Booking.status.in_(active),
+        Booking.start_datetime < end,
+        Booking.end_datetime > start
+    ).first()
+    db.query(Booking).filter(
+        Booking.partner_id == partner_id,
+        Booking.status.in_(active),
+        Booking.start_datetime <= end + timedelta(hours=1),
+        Booking.end_datetime > end
+    ).first()
+    return not (prev_booking or next_booking)
+
+def unified_check(db: Session, partner_id: int, start: datetime, end: datetime) -> bool:
+    return check_partner_conflicts(db, partner_id, start, end).is_available
+
+def seed(db: Session, origin: datetime) -> None:
+    db.add(Customer(email="bench@example.com", hashed_password="-", full_name="Bench",
+                    phone="+6281200000000", kecamatan="Kemang"))
+    for i in range(NUM_PARTNERS):
+        db.add(Partner(full_name=f"Partner {i}", role=PartnerRole.PEMBANTU, experience_years=5,
+                       specializations=[], pricing={}, kecamatan="Kemang"))
+    db.flush()
+    for partner_id in range(1, NUM_PARTNERS + 1):
+        for day in range(BOOKINGS_PER_PARTNER):
+            start = origin + timedelta(days=day, hours=random.randint(8, 16))
+            db.add(Booking(customer_id=1, partner_id=partner_id, type=BookingType.HOURLY,
+                           start_datetime=start, end_datetime=start + timedelta(hours=2),
+                           status=BookingStatus.PENDING, total_price=0))
+    db.commit()
+
+def run(db: Session, statements: list, check, windows) -> tuple:
+    statements.clear()
+    started = time.perf_counter()
+    for partner_id, start, end in windows:
+        check(db, partner_id, start, end)
+    elapsed = time.perf_counter() - started
+    return len(statements) / len(windows), elapsed / len(windows)
+
+def main():
+    random.seed(7)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    origin = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    with Session(engine) as db:
+        seed(db, origin)
+        windows = []
+        for _ in range(NUM_CHECKS):
+            start = origin + timedelta(days=random.randint(0, BOOKINGS_PER_PARTNER), hours=random.randint(6, 20))
+            windows.append((random.randint(1, NUM_PARTNERS), start, start + timedelta(hours=2)))
+
+        print(f"{NUM_CHECKS} checks, {NUM_PARTNERS} partners x {BOOKINGS_PER_PARTNER} bookings")
+        print(f"{'path':<10}{'queries/check':>15}{'ms/check':>10}")
+        for name, check in (("legacy", legacy_check), ("unified", unified_check)):
+            queries, seconds = run(db, statements, check, windows)
+            print(f"{name:<10}{queries:>15.2f}{seconds * 1000:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark MatchingService.find_matches for 50, 200 and 800 candidate partners.
+
+Compares the old availability pre-check, one check_partner_conflicts round
+trip per candidate, with find_matches, which resolves the busy partners of
+the window in one query before scoring. Both run against an in-memory
+SQLite database, where a round trip costs next to nothing; the query
+counts show what each path costs against a real database server.
+
+    python scripts/benchmark_find_matches.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+for key in ("DATABASE_URL", "JWT_SECRET", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(key, "benchmark")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from src.models import Base, Partner, Customer, Booking
+from src.schemas.booking import BookingStatus, BookingType
+from src.schemas.enums import PartnerRole
+from src.schemas.matching import MatchRequest, MatchSortCriteria
+from src.schemas.partner import PartnerFilter
+from src.services.matching_service import MatchingService
+from src.utils.catalog import get_partner_catalog, invalidate_partner_catalog
+from src.utils.conflicts import check_partner_conflicts
+
+SIZES = (50, 200, 800)
+BUSY_SHARE = 0.3
+
+def seed(db: Session, size: int, start: datetime) -> None:
+    """size partners in one kecamatan, about BUSY_SHARE of them booked around start"""
+    db.add(Customer(email="bench@example.com", hashed_password="-", full_name="Bench",
+                    phone="+6281200000000", kecamatan="Kemang", preferences={}))
+    for i in range(size):
+        db.add(Partner(full_name=f"Partner {i}", role=PartnerRole.PEMBANTU,
+                       experience_years=random.randint(0, 30), rating=round(random.uniform(1, 5), 1),
+                       total_reviews=random.choice((0, 3, 20, 200)), specializations=[],
+                       pricing={"hourly_rate": 50000, "daily_rate": 400000, "monthly_rate": 8000000},
+                       kecamatan="Kemang"))
+    db.flush()
+    for partner_id in range(1, size + 1):
+        if random.random() < BUSY_SHARE:
+            booking_start = start + timedelta(hours=random.randint(-2, 2))
+            db.add(Booking(customer_id=1, partner_id=partner_id, type=BookingType.HOURLY,
+                           start_datetime=booking_start, end_datetime=booking_start + timedelta(hours=2),
+                           status=BookingStatus.PENDING, total_price=100000))
+    db.commit()
+
+def per_partner_check(db: Session, request: MatchRequest) -> set:
+    """The old pre-check: one conflict query per candidate"""
+    filters = request.filters.model_copy(update={"role": request.role})
+    end = request.start_datetime + timedelta(hours=1)
+    return {
+        p.id for p in get_partner_catalog(db).search(request.kecamatan, filters)
+        if check_partner_conflicts(db, p.id, request.start_datetime, end).is_available
+    }
+
+def batch_check(db: Session, request: MatchRequest) -> set:
+    return {p.id for p in asyncio.run(MatchingService.find_matches(db, request))}
+
+def measure(engine, func, request, repeat: int = 5):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    best, result, queries = float("inf"), None, 0
+    try:
+        for _ in range(repeat):
+            with Session(engine) as db:
+                get_partner_catalog(db)
+                statements.clear()
+                started = time.perf_counter()
+                result = func(db, request)
+                best = min(best, time.perf_counter() - started)
+                queries = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return best, queries, result
+
+def main():
+    random.seed(42)
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    request = MatchRequest(
+        start_datetime=start, kecamatan="Kemang", role=PartnerRole.PEMBANTU,
+        booking_type=BookingType.HOURLY, filters=PartnerFilter(), sort_by=MatchSortCriteria.SCORE
+    )
+
+    print(f"{'candidates':>10}{'per-partner (ms)':>18}{'queries':>9}{'batch (ms)':>12}{'queries':>9}{'free':>6}")
+    for size in SIZES:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, size, start)
+        invalidate_partner_catalog()
+
+        scalar_time, scalar_queries, expected = measure(engine, per_partner_check, request)
+        batch_time, batch_queries, free = measure(engine, batch_check, request)
+        assert free == expected, "batch availability differs from the per-partner check"
+
+        print(
+            f"{size:>10}{scalar_time * 1000:>18.2f}{scalar_queries:>9}"
+            f"{batch_time * 1000:>12.2f}{batch_queries:>9}{len(free):>6}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark matching scores for 100, 1k and 10k candidate partners.
+
+Compares the per-partner calculate_matching_score loop with
+batch_matching_scores, both including the sort by score. The batch column
+shows scoring of prepared column arrays; the end-to-end column also builds
+the arrays from partner objects. No database is needed; partners and their
+bookings are generated in memory.
+
+    python scripts/benchmark_matching.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+# Settings need these to import; the benchmark never connects to a database
+for key in ("DATABASE_URL", "JWT_SECRET", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(key, "benchmark")
+
+import numpy as np
+from src.schemas.booking import BookingStatus
+from src.utils.matching import (
+    calculate_matching_score, ScoreColumns, batch_matching_scores, rank_by_score
+)
+
+SIZES = (100, 1_000, 10_000)
+BOOKINGS_PER_PARTNER = 3
+
+def generate_partners(start: datetime, count: int):
+    partners = []
+    for partner_id in range(count):
+        bookings = []
+        for _ in range(random.randint(0, BOOKINGS_PER_PARTNER)):
+            booking_start = start + timedelta(hours=random.randint(-48, 48))
+            bookings.append(SimpleNamespace(
+                start_datetime=booking_start,
+                end_datetime=booking_start + timedelta(hours=2),
+                status=random.choice(list(BookingStatus))
+            ))
+        partners.append(SimpleNamespace(
+            id=partner_id,
+            rating=round(random.uniform(1, 5), 1),
+            experience_years=random.randint(0, 30),
+            total_reviews=random.choice((0, 3, 20, 200)),
+            bookings=bookings
+        ))
+    return partners
+
+def scalar_ranking(partners, request):
+    scored = [(p, calculate_matching_score(p, request, {})) for p in partners]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [p.id for p, _ in scored]
+
+def batch_ranking(partners, columns):
+    return [partners[i].id for i in rank_by_score(batch_matching_scores(columns))]
+
+def end_to_end_ranking(partners, request):
+    return batch_ranking(partners, ScoreColumns.from_partners(partners, request.start_datetime))
+
+def measure(func, *args, repeat: int = 5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main():
+    random.seed(42)
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    request = SimpleNamespace(start_datetime=start)
+
+    print(f"{'candidates':>10}{'scalar (ms)':>14}{'batch (ms)':>13}{'speedup':>10}{'end-to-end (ms)':>18}{'speedup':>10}")
+    for size in SIZES:
+        partners = generate_partners(start, size)
+        columns = ScoreColumns.from_partners(partners, start)
+
+        scalar_time, expected = measure(scalar_ranking, partners, request)
+        batch_time, ranked = measure(batch_ranking, partners, columns)
+        full_time, full_ranked = measure(end_to_end_ranking, partners, request)
+        assert ranked == expected == full_ranked, "batch ranking differs from the scalar path"
+        assert np.array_equal(
+            batch_matching_scores(columns),
+            [calculate_matching_score(p, request, {}) for p in partners]
+        ), "batch scores differ from the scalar path"
+
+        print(
+            f"{size:>10}{scalar_time * 1000:>14.2f}{batch_time * 1000:>13.2f}"
+            f"{scalar_time / batch_time:>9.1f}x{full_time * 1000:>18.2f}"
+            f"{scalar_time / full_time:>9.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark slot generation for ScheduleService over a 90-day window.
+
+Compares the previous slots x bookings scan with the interval timeline
+used by ScheduleService.get_available_slots. No database is needed; the
+bookings are generated in memory.
+
+    python scripts/benchmark_slots.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+# Settings need these to import; the benchmark never connects to a database
+for key in ("DATABASE_URL", "JWT_SECRET", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(key, "benchmark")
+
+from src.schemas.enums import BookingType
+from src.services.schedule_service import ScheduleService
+from src.utils.timeline import BusyTimeline
+
+WINDOW_DAYS = 90
+NUM_BOOKINGS = 500
+
+def generate_bookings(start: datetime, count: int):
+    bookings = []
+    for _ in range(count):
+        booking_start = start + timedelta(
+            days=random.randint(0, WINDOW_DAYS - 1),
+            hours=random.randint(8, 18)
+        )
+        bookings.append(SimpleNamespace(
+            start_datetime=booking_start,
+            end_datetime=booking_start + timedelta(hours=random.randint(1, 4))
+        ))
+    return bookings
+
+def legacy_slots(bookings, start, end, booking_type):
+    """The scan get_available_slots used before the timeline"""
+    slots = []
+    current = start
+    while current < end:
+        slot_end, following = ScheduleService._next_slot(booking_type, current)
+        is_available = True
+        for booking in bookings:
+            if (booking.start_datetime <= current < booking.end_datetime or
+                booking.start_datetime < slot_end <= booking.end_datetime):
+                is_available = False
+                break
+        if is_available and booking_type == BookingType.HOURLY:
+            buffer_end = slot_end + timedelta(hours=1)
+            for booking in bookings:
+                if booking.start_datetime <= buffer_end <= booking.end_datetime:
+                    is_available = False
+                    break
+        if is_available:
+            slots.append((current, slot_end))
+        current = following
+    return slots
+
+def timeline_slots(bookings, start, end, booking_type):
+    timeline = BusyTimeline.from_bookings(bookings)
+    return list(timeline.free_slots(
+        start,
+        end,
+        lambda current: ScheduleService._next_slot(booking_type, current)
+    ))
+
+def measure(func, *args, repeat: int = 5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main():
+    random.seed(42)
+    start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=WINDOW_DAYS)
+    bookings = generate_bookings(start, NUM_BOOKINGS)
+
+    print(f"{NUM_BOOKINGS} bookings over {WINDOW_DAYS} days")
+    print(f"{'type':<10}{'legacy (ms)':>14}{'timeline (ms)':>16}{'speedup':>10}{'free slots':>12}")
+    for booking_type in BookingType:
+        legacy_time, _ = measure(legacy_slots, bookings, start, end, booking_type)
+        timeline_time, slots = measure(timeline_slots, bookings, start, end, booking_type)
+        print(
+            f"{booking_type.value:<10}{legacy_time * 1000:>14.2f}{timeline_time * 1000:>16.2f}"
+            f"{legacy_time / timeline_time:>9.1f}x{len(slots):>12}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark specialization filters on the partner catalog for 1k, 10k and
+100k partners.
+
+Compares a scan of every partner in the (kecamatan, role) bucket with the
+bucket's inverted index, for an AND filter (every listed specialization),
+an OR filter (any of them) and an OR filter combined with a rating range.
+No database is needed; partners are generated in memory and spread over
+KECAMATAN_COUNT kecamatan and all roles.
+
+    python scripts/benchmark_specializations.py
+"""
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+# Settings need these to import; the benchmark never connects to a database
+for key in ("DATABASE_URL", "JWT_SECRET", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(key, "benchmark")
+
+from src.schemas.enums import PartnerRole
+from src.schemas.partner import PartnerFilter, PartnerPricing, PartnerResponse, SpecializationMatch
+from src.utils.catalog import PartnerCatalog
+
+SIZES = (1_000, 10_000, 100_000)
+KECAMATAN_COUNT = 10
+SPECIALIZATIONS = [f"spesialisasi_{i}" for i in range(40)]
+FILTERS = {
+    "AND": PartnerFilter(
+        role=PartnerRole.PEMBANTU,
+        specializations=SPECIALIZATIONS[:2],
+        specialization_match=SpecializationMatch.ALL
+    ),
+    "OR": PartnerFilter(
+        role=PartnerRole.PEMBANTU,
+        specializations=SPECIALIZATIONS[:3],
+        specialization_match=SpecializationMatch.ANY
+    ),
+    "OR+rating": PartnerFilter(
+        role=PartnerRole.PEMBANTU,
+        min_rating=4.5,
+        specializations=SPECIALIZATIONS[:3],
+        specialization_match=SpecializationMatch.ANY
+    ),
+}
+
+def generate_partners(count: int):
+    roles = list(PartnerRole)
+    return [
+        PartnerResponse(
+            id=partner_id,
+            full_name=f"Partner {partner_id}",
+            role=random.choice(roles),
+            experience_years=random.randint(0, 30),
+            rating=round(random.uniform(1, 5), 1),
+            total_reviews=random.randint(0, 200),
+            # Skewed, so some specializations are far more common than others
+            specializations=random.sample(SPECIALIZATIONS, random.randint(1, 4)) + (
+                [SPECIALIZATIONS[0]] if random.random() < 0.3 else []
+            ),
+            pricing=PartnerPricing(hourly_rate=50000, daily_rate=400000, monthly_rate=8000000),
+            kecamatan=f"Kecamatan {partner_id % KECAMATAN_COUNT}",
+            is_available=True
+        )
+        for partner_id in range(1, count + 1)
+    ]
+
+def matches(partner: PartnerResponse, filters: PartnerFilter) -> bool:
+    if filters.min_rating and partner.rating < filters.min_rating:
+        return False
+    check = all if filters.specialization_match == SpecializationMatch.ALL else any
+    return check(s in partner.specializations for s in filters.specializations)
+
+def scan(catalog: PartnerCatalog, filters: PartnerFilter):
+    bucket = catalog.buckets[("Kecamatan 0", filters.role)]
+    return [p for p in bucket.partners if matches(p, filters)]
+
+def measure(func, *args, repeat: int = 20):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main():
+    random.seed(42)
+    print(f"{'partners':>9}{'filter':>11}{'matches':>9}{'scan (ms)':>11}{'index (ms)':>12}{'speedup':>10}")
+    for size in SIZES:
+        catalog = PartnerCatalog(generate_partners(size), (size, size, size))
+        for name, filters in FILTERS.items():
+            scan_time, expected = measure(scan, catalog, filters)
+            index_time, found = measure(catalog.search, "Kecamatan 0", filters)
+            assert found == expected, "indexed search differs from the scan"
+            print(
+                f"{size:>9}{name:>11}{len(found):>9}{scan_time * 1000:>11.3f}"
+                f"{index_time * 1000:>12.3f}{scan_time / index_time:>9.1f}x"
+            )
+
+if __name__ == "__main__":
+    main()
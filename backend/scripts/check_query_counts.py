@@ -0,0 +1,99 @@
+"""
+Check that list endpoints run a constant number of queries whatever the
+number of bookings and notifications they return, i.e. that nested
+partners and bookings are eager-loaded instead of lazy-loaded per row.
+
+Each service is called on a small and a large data set against an
+in-memory SQLite database. Exits non-zero when a query count grows.
+
+    python scripts/check_query_counts.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+for key in ("DATABASE_URL", "JWT_SECRET", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+    os.environ.setdefault(key, "benchmark")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from src.models import Base, Partner, Customer, Booking, Notification
+from src.schemas.booking import BookingStatus, BookingType
+from src.schemas.enums import PartnerRole
+from src.schemas.notification import NotificationType
+from src.services.booking_service import BookingService
+from src.services.customer_service import CustomerService
+from src.services.notification_service import NotificationService
+
+SIZES = (5, 60)
+STATUSES = (BookingStatus.PENDING, BookingStatus.COMPLETED, BookingStatus.CANCELLED)
+
+ENDPOINTS = {
+    "GET /bookings/": lambda db: BookingService.get_customer_bookings(db, 1, limit=100),
+    "GET /bookings/schedule": lambda db: BookingService.get_schedule_summary(
+        db, 1, upcoming_limit=100, past_limit=100, cancelled_limit=100
+    ),
+    "GET /notifications/": lambda db: NotificationService.get_customer_notifications(db, 1),
+    "GET /customers/dashboard": lambda db: CustomerService.get_dashboard(db, 1),
+}
+
+def seed(db: Session, size: int) -> None:
+    """size bookings with one notification each, every booking with its own partner"""
+    now = datetime.now(timezone.utc)
+    db.add(Customer(email="check@example.com", hashed_password="-", full_name="Check",
+                    phone="+6281200000000", kecamatan="Tebet", preferences={}))
+    for i in range(size):
+        db.add(Partner(full_name=f"Partner {i}", role=PartnerRole.PEMBANTU, experience_years=5,
+                       total_reviews=0, specializations=[],
+                       pricing={"hourly_rate": 50000, "daily_rate": 400000, "monthly_rate": 8000000},
+                       kecamatan="Kemang"))
+    db.flush()
+    for i in range(size):
+        status = STATUSES[i % len(STATUSES)]
+        offset = timedelta(days=i + 1)
+        start = now + offset if status == BookingStatus.PENDING else now - offset
+        booking = Booking(customer_id=1, partner_id=i + 1, type=BookingType.HOURLY,
+                          start_datetime=start, end_datetime=start + timedelta(hours=2),
+                          status=status, total_price=100000)
+        db.add(booking)
+        db.flush()
+        db.add(Notification(customer_id=1, booking_id=booking.id,
+                            type=NotificationType.BOOKING_CONFIRMATION,
+                            message="-", scheduled_for=now, is_read=False))
+    db.commit()
+
+def count_queries(size: int) -> dict:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed(db, size)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    counts = {}
+    for name, call in ENDPOINTS.items():
+        # A fresh session per call, so nothing is served from the identity map
+        with Session(engine) as db:
+            statements.clear()
+            asyncio.run(call(db))
+            counts[name] = len(statements)
+    return counts
+
+def main():
+    results = {size: count_queries(size) for size in SIZES}
+    print(f"{'endpoint':<26}" + "".join(f"{f'{size} rows':>10}" for size in SIZES))
+    failed = False
+    for name in ENDPOINTS:
+        counts = [results[size][name] for size in SIZES]
+        growing = len(set(counts)) > 1
+        failed |= growing
+        print(f"{name:<26}" + "".join(f"{count:>10}" for count in counts) + ("  GROWS" if growing else ""))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import random
-from datetime import datetime, timedelta
+from datetime import time
 from typing import List, Dict
 
 # Constants for data generation
@@ -114,30 +114,28 @@ def create_single_partner(kecamatan: str, role: str, is_baseline: bool = False)
         "profile_description": f"Experienced {role.lower().replace('_', ' ')} with {experience_years} years of experience specializing in {', '.join(role_specializations[:2])}."
     }
 
-def generate_partner_availability(partner_id: int) -> List[Dict]:
-    availabilities = []
-    start_date = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
-    
-    for day in range(7):  # Generate for next 7 days
-        current_date = start_date + timedelta(days=day)
-        
-        # Morning shift: 8 AM - 2 PM
-        # Afternoon shift: 2 PM - 8 PM
-        shifts = [
-            (current_date.replace(hour=8), current_date.replace(hour=14)),
-            (current_date.replace(hour=14), current_date.replace(hour=20))
-        ]
-        
-        for start_time, end_time in shifts:
-            is_blocked = random.random() < 0.3  # 30% chance of being blocked
-            availabilities.append({
-                "partner_id": partner_id,
-                "start_time": start_time,
-                "end_time": end_time,
-                "is_blocked": is_blocked
-            })
-    
-    return availabilities
+def generate_partner_availability_rules(partner_id: int) -> List[Dict]:
+    """Weekly blocked shifts, expanded into concrete windows only when queried"""
+    rules = []
+
+    # Morning shift: 8 AM - 2 PM
+    # Afternoon shift: 2 PM - 8 PM
+    shifts = [(time(8), time(14)), (time(14), time(20))]
+
+    for start_time, end_time in shifts:
+        # 30% chance of being blocked on each day of the week
+        weekdays = [day for day in range(7) if random.random() < 0.3]
+        if not weekdays:
+            continue
+        rules.append({
+            "partner_id": partner_id,
+            "weekdays": weekdays,
+            "start_time": start_time,
+            "end_time": end_time,
+            "is_blocked": True
+        })
+
+    return rules
 
 # Generate the dummy data
 partners = generate_partner_data(100)
@@ -0,0 +1,50 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from src.utils.archive import ARCHIVE_DDL, archive_finished_bookings, detach_archive_partitions
+from src.config.settings import settings
+
+def maintain():
+    """
+    Move finished bookings of deactivated customers older than
+    BOOKING_ARCHIVE_AFTER_DAYS to the monthly archive partitions. With a YYYY-MM argument, archive partitions
+    of earlier months are detached afterwards.
+    """
+    engine = create_engine(settings.DATABASE_URL)
+    session = Session(engine)
+
+    try:
+        detach_before = datetime.strptime(sys.argv[1], "%Y-%m").date() if len(sys.argv) > 1 else None
+        for ddl in ARCHIVE_DDL:
+            session.execute(ddl)
+        session.commit()
+
+        before = datetime.now(timezone.utc) - timedelta(days=settings.BOOKING_ARCHIVE_AFTER_DAYS)
+        archived = 0
+        while True:
+            count = archive_finished_bookings(session, before)
+            session.commit()
+            archived += count
+            if count < settings.BOOKING_ARCHIVE_BATCH:
+                break
+        print(f"Archived {archived} bookings that ended before {before:%Y-%m-%d}.")
+
+        if detach_before:
+            detached = detach_archive_partitions(session, detach_before)
+            session.commit()
+            print(f"Detached {len(detached)} archive partitions: {', '.join(detached) or '-'}")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    maintain()
@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from src.utils.idempotency import purge_expired_keys
+from src.config.settings import settings
+
+def purge():
+    """Delete idempotency keys past their TTL"""
+    engine = create_engine(settings.DATABASE_URL)
+    session = Session(engine)
+
+    try:
+        count = purge_expired_keys(session)
+        session.commit()
+        print(f"Deleted {count} expired idempotency keys.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    purge()
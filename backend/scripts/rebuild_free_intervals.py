@@ -0,0 +1,30 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from src.utils.free_intervals import rebuild_free_intervals
+from src.config.settings import settings
+
+def rebuild():
+    """Recompute partner_free_intervals from bookings and blocked availabilities"""
+    engine = create_engine(settings.DATABASE_URL)
+    session = Session(engine)
+
+    try:
+        partner_ids = [int(arg) for arg in sys.argv[1:]] or None
+        count = rebuild_free_intervals(session, partner_ids)
+        session.commit()
+        print(f"Rebuilt {count} free intervals for the next {settings.FREE_INTERVAL_HORIZON_DAYS} days.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,39 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from src.utils.lifecycle import run_booking_lifecycle
+from src.config.settings import settings
+
+def add_completed_notification_type(engine) -> None:
+    """Add BOOKING_COMPLETED to the notification type enum of databases created before it"""
+    with engine.begin() as connection:
+        connection.execute(text(
+            "ALTER TYPE notificationtype ADD VALUE IF NOT EXISTS 'BOOKING_COMPLETED'"
+        ))
+
+def run():
+    """Complete every booking that has ended and print the throughput"""
+    engine = create_engine(settings.DATABASE_URL)
+    session = Session(engine)
+
+    try:
+        add_completed_notification_type(engine)
+        stats = run_booking_lifecycle(session)
+        print(
+            f"Completed {stats.completed} bookings in {stats.batches} batches "
+            f"({stats.seconds:.2f}s, {stats.per_second:.0f} bookings/s)."
+        )
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    run()
@@ -9,13 +9,14 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from src.models.partner import Partner
-from src.models.partner_availability import PartnerAvailability
+from src.models.partner_availability_rule import PartnerAvailabilityRule
 from src.schemas.partner import PartnerRole
 from src.models.base import Base
 from src.config.settings import settings
+from src.utils import free_intervals  # Derives free intervals of new partners on commit
 
 # Import the dummy data generator functions
-from dummy_data import generate_partner_data, generate_partner_availability
+from dummy_data import generate_partner_data, generate_partner_availability_rules
 
 def seed_database():
     # Create database engine using settings
@@ -54,21 +55,21 @@ def seed_database():
             session.add(partner)
             session.flush()  # To get the partner ID
             
-            # Generate and insert availability for each partner
-            availabilities = generate_partner_availability(partner.id)
-            for avail in availabilities:
-                availability = PartnerAvailability(
-                    partner_id=avail['partner_id'],
-                    start_time=avail['start_time'],
-                    end_time=avail['end_time'],
-                    is_blocked=avail['is_blocked']
-                )
-                session.add(availability)
+            # Generate and insert recurring availability rules for each partner
+            rules = generate_partner_availability_rules(partner.id)
+            for rule in rules:
+                session.add(PartnerAvailabilityRule(
+                    partner_id=rule['partner_id'],
+                    weekdays=rule['weekdays'],
+                    start_time=rule['start_time'],
+                    end_time=rule['end_time'],
+                    is_blocked=rule['is_blocked']
+                ))
             
             if i % 10 == 0:  # Progress update every 10 partners
                 print(f"Processed {i} partners...")
         
-        # Commit all changes
+        # Commit all changes; free intervals of the new partners are derived on commit
         session.commit()
         print("Successfully seeded the database!")
         
@@ -19,8 +19,36 @@ class Settings(BaseSettings):
     # Business Rules
     MAX_HOURLY_DURATION: int = 6
     MAX_DAILY_DURATION: int = 7
+    MAX_MONTHLY_DURATION: int = 12
+    MAX_SERIES_OCCURRENCES: int = 52
+    MAX_SERIES_INTERVAL_WEEKS: int = 52
+    MAX_QUOTE_ITEMS: int = 50
+    DEFAULT_PAGE_SIZE: int = 20
+    MAX_PAGE_SIZE: int = 100
+    SLOT_HOLD_MINUTES: int = 5
     BREAK_DURATION: int = 1
+    AVAILABILITY_BUCKET_MINUTES: int = 15
+    MAX_AVAILABILITY_BATCH_SIZE: int = 50
+    EARLIEST_SLOT_SEARCH_DAYS: int = 14
+    MAX_EARLIEST_SLOT_RESULTS: int = 20
+    FREE_INTERVAL_HORIZON_DAYS: int = 90
+    FREE_INTERVAL_REBUILD_SECONDS: int = 3600
+    FREE_INTERVAL_REBUILD_BATCH: int = 200
+    LOCAL_UTC_OFFSET: int = 7  # WIB
+    AVAILABILITY_RULE_CACHE_SECONDS: int = 300
+    PRICING_CACHE_SIZE: int = 4096
+    PARTNER_CATALOG_POLL_SECONDS: int = 30
     NOTIFICATION_REMINDER: int = 30
+    NOTIFICATION_DISPATCH_SECONDS: int = 10
+    NOTIFICATION_DISPATCH_BATCH: int = 500
+    BOOKING_LIFECYCLE_SECONDS: int = 60
+    BOOKING_LIFECYCLE_BATCH: int = 500
+    BOOKING_ARCHIVE_AFTER_DAYS: int = 365
+    BOOKING_ARCHIVE_BATCH: int = 1000
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_CACHE_SIZE: int = 1024
+    IDEMPOTENCY_WAIT_SECONDS: int = 10
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # In-flight claims of crashed requests expire
     
     MINIMUM_CANCELLATION_NOTICE: int = 2
     MAXIMUM_ACTIVE_BOOKINGS: int = 3
@@ -52,6 +80,10 @@ class Settings(BaseSettings):
         "PARTNER_UNAVAILABLE": {
             "title": "Partner Unavailable",
             "template": "Your partner is no longer available for the scheduled time"
+        },
+        "BOOKING_COMPLETED": {
+            "title": "Booking Completed",
+            "template": "Your booking with {partner_name} is complete, leave a review"
         }
     }
     
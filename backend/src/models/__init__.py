@@ -4,8 +4,13 @@ from .partner import Partner
 from .booking import Booking
 from .customer import Customer
 from .notification import Notification
+from .notification_outbox import NotificationOutbox
 from .partner_availability import PartnerAvailability
+from .partner_availability_rule import PartnerAvailabilityRule
+from .partner_free_interval import PartnerFreeInterval
 from .review import Review
+from .idempotency_key import IdempotencyKey
+from .slot_hold import SlotHold
 
 __all__ = [
     "Base",
@@ -14,6 +19,11 @@ __all__ = [
     "Booking",
     "Customer",
     "Notification",
+    "NotificationOutbox",
     "PartnerAvailability",
-    "Review"
+    "PartnerAvailabilityRule",
+    "PartnerFreeInterval",
+    "Review",
+    "IdempotencyKey",
+    "SlotHold"
 ]
\ No newline at end of file
@@ -1,13 +1,37 @@
 # src/models/booking.py
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import ForeignKey, Enum, Float, DateTime
+from sqlalchemy import ForeignKey, Enum, Float, DateTime, DDL, Index, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base, TimestampModel
 from src.schemas.booking import BookingType, BookingStatus
+from src.config.settings import settings
+
+BOOKING_OVERLAP_CONSTRAINT = "bookings_no_overlap"
 
 class Booking(Base, TimestampModel):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Keyset pagination of a customer's booking history
+        Index("ix_bookings_customer_start_id", "customer_id", "start_datetime", "id"),
+        # Partner schedule lookups skip cancelled bookings, so those never
+        # grow this index. Same predicate as the overlap constraint: completed
+        # bookings still need their break. Status IN ('PENDING', 'CONFIRMED')
+        # filters imply it and use the index too.
+        Index(
+            "ix_bookings_partner_live",
+            "partner_id",
+            "start_datetime",
+            "end_datetime",
+            postgresql_where=text("status <> 'CANCELLED'")
+        ),
+        # Bookings the lifecycle worker still has to complete
+        Index(
+            "ix_bookings_active_end",
+            "end_datetime",
+            postgresql_where=text("status IN ('PENDING', 'CONFIRMED')")
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     cancellation_reason: Mapped[Optional[str]] = mapped_column(nullable=True)
@@ -27,4 +51,31 @@ class Booking(Base, TimestampModel):
     customer: Mapped["Customer"] = relationship(back_populates="bookings")
     partner: Mapped["Partner"] = relationship(back_populates="bookings")
     notifications: Mapped[List["Notification"]] = relationship(back_populates="booking")
-    review: Mapped[Optional["Review"]] = relationship("Review", back_populates="booking", uselist=False)
\ No newline at end of file
+    review: Mapped[Optional["Review"]] = relationship("Review", back_populates="booking", uselist=False)
+
+# Postgres rejects overlapping bookings of the same partner, including the
+# break after each booking. Ranges are kept in UTC because adding an
+# interval to a timestamptz is not immutable and cannot be a generated column.
+BOOKING_OVERLAP_DDL = [
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+    DDL(
+        "ALTER TABLE bookings ADD COLUMN IF NOT EXISTS booked_range tsrange "
+        "GENERATED ALWAYS AS (tsrange("
+        "start_datetime AT TIME ZONE 'UTC', "
+        f"(end_datetime AT TIME ZONE 'UTC') + interval '{settings.BREAK_DURATION} hours'"
+        ")) STORED"
+    ),
+    DDL(
+        "DO $$ BEGIN "
+        "IF NOT EXISTS (SELECT 1 FROM pg_constraint "
+        f"WHERE conname = '{BOOKING_OVERLAP_CONSTRAINT}') THEN "
+        f"ALTER TABLE bookings ADD CONSTRAINT {BOOKING_OVERLAP_CONSTRAINT} "
+        "EXCLUDE USING gist (partner_id WITH =, booked_range WITH &&) "
+        "WHERE (status <> 'CANCELLED'); "
+        "END IF; "
+        "END $$"
+    ),
+]
+
+for ddl in BOOKING_OVERLAP_DDL:
+    event.listen(Booking.__table__, "after_create", ddl.execute_if(dialect="postgresql"))
@@ -0,0 +1,24 @@
+# src/models/idempotency_key.py
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import ForeignKey, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base, TimestampModel
+
+class IdempotencyKey(Base, TimestampModel):
+    """
+    Idempotency-Key sent by a customer with a write request. The row is
+    claimed before the request runs; response stays empty while it is in
+    flight and holds the stored result once it finished.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("customer_id", "key", name="uq_idempotency_keys_customer_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"))
+    key: Mapped[str] = mapped_column(String(255))
+    request_hash: Mapped[str] = mapped_column(String(64))
+    response: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
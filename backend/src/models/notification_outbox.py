@@ -0,0 +1,20 @@
+# src/models/notification_outbox.py
+from datetime import datetime
+from sqlalchemy import ForeignKey, Enum, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base, TimestampModel
+from src.schemas.notification import NotificationType
+
+class NotificationOutbox(Base, TimestampModel):
+    """
+    Notification written in the same transaction as its booking, moved to
+    notifications by the dispatcher once scheduled_for has passed.
+    """
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"))
+    booking_id: Mapped[int] = mapped_column(ForeignKey("bookings.id"), index=True)
+    type: Mapped[NotificationType] = mapped_column(Enum(NotificationType))
+    message: Mapped[str] = mapped_column(String)
+    scheduled_for: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
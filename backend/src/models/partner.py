@@ -1,5 +1,5 @@
 from typing import List, Dict
-from sqlalchemy import String, Float, Boolean, JSON, Enum
+from sqlalchemy import String, Float, Boolean, JSON, Enum, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base, TimestampModel
 from src.schemas.partner import PartnerRole
@@ -13,11 +13,19 @@ class Partner(Base, TimestampModel):
     experience_years: Mapped[int] = mapped_column()
     rating: Mapped[float] = mapped_column(Float, default=5.0)
     total_reviews: Mapped[int] = mapped_column(default=0)
-    specializations: Mapped[Dict] = mapped_column(JSON)
+    specializations: Mapped[List[str]] = mapped_column(JSON)
     pricing: Mapped[Dict] = mapped_column(JSON)
     kecamatan: Mapped[str] = mapped_column(String, index=True)
     is_available: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Bumped on every update, lets caches of partner data detect changes
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
 
     # Gunakan string untuk reference
     availabilities: Mapped[List["PartnerAvailability"]] = relationship(back_populates="partner")
-    bookings: Mapped[List["Booking"]] = relationship("Booking", back_populates="partner")
\ No newline at end of file
+    availability_rules: Mapped[List["PartnerAvailabilityRule"]] = relationship(back_populates="partner")
+    bookings: Mapped[List["Booking"]] = relationship("Booking", back_populates="partner")
+
+@event.listens_for(Partner, "before_update")
+def _bump_version(mapper, connection, target) -> None:
+    # Incremented in SQL so concurrent updates never reuse a version
+    target.version = Partner.version + 1
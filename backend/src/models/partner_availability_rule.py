@@ -0,0 +1,25 @@
+# src/models/partner_availability_rule.py
+from datetime import date, time
+from typing import List, Optional
+from sqlalchemy import ForeignKey, Boolean, Time, Date, JSON
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from .base import Base, TimestampModel
+
+class PartnerAvailabilityRule(Base, TimestampModel):
+    """
+    Weekly recurring availability window of a partner, expanded into
+    concrete intervals only for the range being queried.
+    """
+    __tablename__ = "partner_availability_rules"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    partner_id: Mapped[int] = mapped_column(ForeignKey("partners.id"), index=True)
+    weekdays: Mapped[List[int]] = mapped_column(JSON)  # 0 = Monday
+    start_time: Mapped[time] = mapped_column(Time)  # Local (WIB) wall-clock time
+    end_time: Mapped[time] = mapped_column(Time)
+    is_blocked: Mapped[bool] = mapped_column(Boolean, default=True)
+    valid_from: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    valid_until: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    exceptions: Mapped[List[str]] = mapped_column(JSON, default=list)  # ISO dates skipped
+
+    partner: Mapped["Partner"] = relationship(back_populates="availability_rules")
@@ -0,0 +1,20 @@
+# src/models/partner_free_interval.py
+from datetime import datetime
+from sqlalchemy import ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base, TimestampModel
+
+class PartnerFreeInterval(Base, TimestampModel):
+    """
+    Free time of a partner: the complement of bookings (plus their break)
+    and blocked availabilities, maintained alongside booking writes.
+    """
+    __tablename__ = "partner_free_intervals"
+    __table_args__ = (
+        Index("ix_partner_free_intervals_lookup", "partner_id", "start_time", "end_time"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    partner_id: Mapped[int] = mapped_column(ForeignKey("partners.id"))
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -0,0 +1,22 @@
+# src/models/slot_hold.py
+from datetime import datetime
+from sqlalchemy import ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base, TimestampModel
+
+class SlotHold(Base, TimestampModel):
+    """
+    Short-lived reservation of a partner's slot by a customer during
+    checkout. Treated like a booking until it expires or is turned into one.
+    """
+    __tablename__ = "slot_holds"
+    __table_args__ = (
+        Index("ix_slot_holds_lookup", "partner_id", "start_datetime", "end_datetime"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    partner_id: Mapped[int] = mapped_column(ForeignKey("partners.id"))
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"))
+    start_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    end_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -1,35 +1,114 @@
 # src/routes/bookings.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from src.schemas.booking import BookingCreate, BookingResponse, BookingCancel
+from src.schemas.booking import (
+    BookingCreate, BookingResponse, BookingCancel, BookingStatus,
+    BookingSeriesCreate, BookingSeriesResponse,
+    SlotHoldCreate, SlotHoldResponse,
+    PriceQuoteRequest, PriceQuote
+)
 from src.schemas.schedule import ScheduleResponse
+from src.schemas.base import PageResponse
 from src.services.booking_service import BookingService
+from src.services.hold_service import HoldService
 from src.database.session import get_db
 from src.utils.deps import get_current_customer
+from src.utils.idempotency import run_idempotent
+from src.config.settings import settings
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
 @router.post("/", response_model=BookingResponse)
 async def create_booking(
     booking: BookingCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     current_customer = Depends(get_current_customer)
 ):
-    """Create a new booking"""
+    """Create a new booking, once per Idempotency-Key when one is sent"""
     try:
+        if idempotency_key:
+            return await run_idempotent(
+                db,
+                current_customer.id,
+                idempotency_key,
+                booking,
+                lambda: BookingService.create_booking(db, current_customer.id, booking)
+            )
         return await BookingService.create_booking(db, current_customer.id, booking)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[BookingResponse])
+@router.post("/series", response_model=BookingSeriesResponse)
+async def create_booking_series(
+    series: BookingSeriesCreate,
+    db: Session = Depends(get_db),
+    current_customer = Depends(get_current_customer)
+):
+    """Book a recurring weekly series in one transaction"""
+    try:
+        return await BookingService.create_booking_series(db, current_customer.id, series)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/quote", response_model=List[PriceQuote])
+async def quote_prices(
+    request: PriceQuoteRequest,
+    db: Session = Depends(get_db),
+    current_customer = Depends(get_current_customer)
+):
+    """Price several booking options without booking them"""
+    return await BookingService.quote_prices(db, request.items)
+
+@router.post("/holds", response_model=SlotHoldResponse)
+async def create_hold(
+    hold: SlotHoldCreate,
+    db: Session = Depends(get_db),
+    current_customer = Depends(get_current_customer)
+):
+    """Hold a partner's slot for a few minutes during checkout"""
+    try:
+        return await HoldService.create_hold(db, current_customer.id, hold)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(
+    hold_id: int,
+    db: Session = Depends(get_db),
+    current_customer = Depends(get_current_customer)
+):
+    """Release a slot hold before it expires"""
+    try:
+        await HoldService.release_hold(db, current_customer.id, hold_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/", response_model=PageResponse[BookingResponse])
 async def get_bookings(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    status: Optional[BookingStatus] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_customer = Depends(get_current_customer)
 ):
-    """Get all customer bookings"""
-    return await BookingService.get_customer_bookings(db, current_customer.id)
+    """Get customer bookings, newest first, one page at a time"""
+    try:
+        return await BookingService.get_customer_bookings(
+            db,
+            current_customer.id,
+            cursor,
+            limit,
+            status,
+            start_from,
+            start_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/{booking_id}/cancel", response_model=BookingResponse)
 async def cancel_booking(
@@ -71,8 +150,26 @@ async def reschedule_booking(
 
 @router.get("/schedule", response_model=ScheduleResponse)
 async def get_schedule(
+    upcoming_cursor: Optional[str] = None,
+    past_cursor: Optional[str] = None,
+    cancelled_cursor: Optional[str] = None,
+    upcoming_limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    past_limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cancelled_limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_customer = Depends(get_current_customer)
 ):
     """Get customer schedule summary"""
-    return await BookingService.get_schedule_summary(db, current_customer.id)
\ No newline at end of file
+    try:
+        return await BookingService.get_schedule_summary(
+            db,
+            current_customer.id,
+            upcoming_cursor,
+            past_cursor,
+            cancelled_cursor,
+            upcoming_limit,
+            past_limit,
+            cancelled_limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -3,13 +3,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
-from src.schemas.partner import PartnerResponse, PartnerFilter
-from src.schemas.matching import MatchRequest, MatchResponse
-from src.schemas.schedule import PartnerAvailability
+from src.schemas.partner import PartnerResponse, PartnerFilter, SpecializationMatch
+from src.schemas.matching import MatchRequest, MatchResponse, MatchSortCriteria, EarliestSlotResponse
+from src.schemas.schedule import PartnerAvailability, PartnerAvailabilityBatchRequest
 from src.schemas.enums import PartnerRole, BookingType
 from src.services.partner_service import PartnerService
 from src.database.session import get_db
 from src.utils.deps import get_current_customer
+from src.config.settings import settings
 
 router = APIRouter(prefix="/partners", tags=["Partners"])
 
@@ -21,20 +22,34 @@ async def search_partners(
     min_experience: Optional[int] = None,
     max_hourly_rate: Optional[float] = None,
     specialization: Optional[str] = None,
+    specializations: Optional[List[str]] = Query(None),
+    specialization_match: SpecializationMatch = SpecializationMatch.ALL,
+    sort_by: Optional[MatchSortCriteria] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_customer = Depends(get_current_customer)
 ):
-    """Search partners with filters"""
+    """Search partners with filters, sorted by rating, experience or price when asked"""
     filters = PartnerFilter(
         role=role,
         min_rating=min_rating,
         min_experience=min_experience,
         max_hourly_rate=max_hourly_rate,
-        specialization=specialization
+        specialization=specialization,
+        specializations=specializations,
+        specialization_match=specialization_match
     )
     
     try:
-        partners = await PartnerService.get_partners(db, kecamatan, filters)
+        partners = await PartnerService.get_partners(
+            db,
+            kecamatan,
+            filters,
+            sort_by,
+            limit,
+            offset
+        )
         return partners
     except Exception as e:
         raise HTTPException(
@@ -45,11 +60,63 @@ async def search_partners(
 @router.post("/match", response_model=List[PartnerResponse])
 async def match_partners(
     request: MatchRequest,
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_customer = Depends(get_current_customer)
 ):
-    """Get matched partners based on criteria"""
-    return await PartnerService.search_partners(db, request)
+    """Get matched partners based on criteria, ordered by request.sort_by"""
+    return await PartnerService.search_partners(
+        db,
+        request,
+        limit=limit,
+        offset=offset,
+        customer_id=current_customer.id
+    )
+
+@router.get("/earliest", response_model=List[EarliestSlotResponse])
+async def find_earliest_slots(
+    kecamatan: str,
+    role: PartnerRole,
+    booking_type: BookingType = BookingType.HOURLY,
+    duration: int = Query(1, ge=1, le=max(
+        settings.MAX_HOURLY_DURATION,
+        settings.MAX_DAILY_DURATION,
+        settings.MAX_MONTHLY_DURATION
+    )),
+    k: int = Query(5, ge=1, le=settings.MAX_EARLIEST_SLOT_RESULTS),
+    after: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_customer = Depends(get_current_customer)
+):
+    """Find the soonest slots across all partners in a kecamatan"""
+    try:
+        return await PartnerService.find_earliest_slots(
+            db,
+            kecamatan,
+            role,
+            booking_type,
+            duration,
+            k,
+            after,
+            customer_id=current_customer.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/availability:batch", response_model=List[PartnerAvailability])
+async def get_partners_availability(
+    request: PartnerAvailabilityBatchRequest,
+    db: Session = Depends(get_db),
+    current_customer = Depends(get_current_customer)
+):
+    """Get availability schedules of many partners at once"""
+    return await PartnerService.get_partners_availability(
+        db,
+        request.partner_ids,
+        request.start_date,
+        request.end_date
+    )
 
 @router.get("/{partner_id}", response_model=PartnerResponse)
 async def get_partner_details(
@@ -10,6 +10,7 @@ class PageResponse(BaseModel, Generic[T]):
     total: int
     page: int = 1
     per_page: int = 10
+    next_cursor: Optional[str] = None  # Pass back as cursor for the next page
 
 class Response(BaseModel, Generic[T]):
     status: str = "success"
@@ -1,6 +1,6 @@
 # src/schemas/booking.py
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Annotated
 from datetime import datetime, timedelta
 from enum import Enum
 from .enums import PartnerRole, BookingType
@@ -47,6 +47,46 @@ class BookingCreate(BaseModel):
         
         return v
     
+class BookingSeriesCreate(BookingCreate):
+    """First occurrence of the series, repeated every interval_weeks weeks"""
+    occurrences: int = Field(ge=1, le=settings.MAX_SERIES_OCCURRENCES)
+    interval_weeks: int = Field(default=1, ge=1, le=settings.MAX_SERIES_INTERVAL_WEEKS)
+    allow_partial: bool = False  # Book the free occurrences, skip the rest
+
+class SlotHoldCreate(BaseModel):
+    partner_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+
+    @validator('start_datetime')
+    def validate_hold_time(cls, v):
+        if v.astimezone() < datetime.now().astimezone():
+            raise ValueError("Cannot hold a slot in the past")
+        return v
+
+    @validator('end_datetime')
+    def validate_hold_duration(cls, v, values):
+        if 'start_datetime' not in values:
+            return v
+
+        duration = v.astimezone() - values['start_datetime'].astimezone()
+        if duration.total_seconds() <= 0:
+            raise ValueError("End time must be after start time")
+        # No hold may outlast the longest booking it could turn into
+        if duration > timedelta(days=30 * settings.MAX_MONTHLY_DURATION):
+            raise ValueError(f"Holds cannot exceed {settings.MAX_MONTHLY_DURATION} months")
+        return v
+
+class SlotHoldResponse(BaseModel):
+    id: int
+    partner_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class BookingCancel(BaseModel):
     reason: str
     cancellation_time: datetime
@@ -74,3 +114,33 @@ class BookingResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class SeriesConflict(BaseModel):
+    start_datetime: datetime
+    end_datetime: datetime
+    reason: str
+
+class BookingSeriesResponse(BaseModel):
+    bookings: List[BookingResponse]
+    conflicts: List[SeriesConflict]
+
+class PriceQuoteItem(BaseModel):
+    partner_id: int
+    type: BookingType
+    start_datetime: datetime
+    end_datetime: datetime
+
+    @validator('end_datetime')
+    def validate_interval(cls, v, values):
+        if 'start_datetime' in values and v <= values['start_datetime']:
+            raise ValueError("End time must be after start time")
+        return v
+
+class PriceQuoteRequest(BaseModel):
+    items: Annotated[
+        List[PriceQuoteItem],
+        Field(min_length=1, max_length=settings.MAX_QUOTE_ITEMS)
+    ]
+
+class PriceQuote(PriceQuoteItem):
+    total_price: Optional[float] = None  # None when the partner is not available
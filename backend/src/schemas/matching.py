@@ -8,12 +8,14 @@ from enum import Enum
 
 
 class MatchSortCriteria(str, Enum):
+    SCORE = "score"
     RATING = "rating"
     EXPERIENCE = "experience" 
     PRICE = "price"
 
 class MatchRequest(BaseModel):
     start_datetime: datetime
+    end_datetime: Optional[datetime] = None  # Only return partners free until then
     kecamatan: str
     role: PartnerRole
     booking_type: BookingType
@@ -23,4 +25,10 @@ class MatchRequest(BaseModel):
 class MatchResponse(BaseModel):
     recommended_partners: List[PartnerResponse]
     matching_score: float
-    availability_confirmed: bool
\ No newline at end of file
+    availability_confirmed: bool
+
+class EarliestSlotResponse(BaseModel):
+    partner: PartnerResponse
+    start_datetime: datetime
+    end_datetime: datetime
+    matching_score: float
@@ -9,6 +9,7 @@ class NotificationType(str, Enum):
     SCHEDULE_CHANGE = "schedule_change"
     BOOKING_CONFIRMATION = "booking_confirmation"
     PARTNER_UNAVAILABLE = "partner_unavailable"
+    BOOKING_COMPLETED = "booking_completed"
 
 class NotificationCreate(BaseModel):
     customer_id: int
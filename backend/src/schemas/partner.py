@@ -5,12 +5,18 @@ from datetime import datetime
 from enum import Enum
 from .enums import PartnerRole, BookingType
 
+class SpecializationMatch(str, Enum):
+    ALL = "all"  # Partner has every listed specialization
+    ANY = "any"  # Partner has at least one of them
+
 class PartnerFilter(BaseModel):
     role: Optional[PartnerRole] = None
     min_rating: Optional[float] = None
     min_experience: Optional[int] = None 
     max_hourly_rate: Optional[float] = None
     specialization: Optional[str] = None
+    specializations: Optional[List[str]] = None
+    specialization_match: SpecializationMatch = SpecializationMatch.ALL
 
 class PartnerPricing(BaseModel):
     hourly_rate: confloat(ge=0)
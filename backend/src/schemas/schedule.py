@@ -1,8 +1,10 @@
 # src/schemas/schedule.py
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Annotated
 from datetime import datetime
 from .booking import BookingResponse
+from .base import PageResponse
+from src.config.settings import settings
 
 class TimeSlot(BaseModel):
     start_time: datetime
@@ -14,7 +16,15 @@ class PartnerAvailability(BaseModel):
     available_slots: List[TimeSlot]
     blocked_slots: List[TimeSlot]
 
+class PartnerAvailabilityBatchRequest(BaseModel):
+    partner_ids: Annotated[
+        List[int],
+        Field(min_length=1, max_length=settings.MAX_AVAILABILITY_BATCH_SIZE)
+    ]
+    start_date: datetime
+    end_date: datetime
+
 class ScheduleResponse(BaseModel):
-    upcoming_bookings: List[BookingResponse]
-    past_bookings: List[BookingResponse]
-    cancelled_bookings: List[BookingResponse]
+    upcoming_bookings: PageResponse[BookingResponse]
+    past_bookings: PageResponse[BookingResponse]
+    cancelled_bookings: PageResponse[BookingResponse]
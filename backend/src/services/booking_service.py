@@ -1,15 +1,35 @@
 # src/services/booking_service.py
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, case, func, and_, or_, tuple_
+from sqlalchemy.orm import Session, Query
+from sqlalchemy.exc import IntegrityError
 from src.models.booking import Booking
 from src.models.partner import Partner
-from src.schemas.booking import BookingCreate, BookingStatus, BookingResponse
-from src.utils.validation import validate_partner_availability
-from src.utils.notification import schedule_booking_notifications
+from src.schemas.booking import (
+    BookingCreate, BookingStatus, BookingResponse,
+    BookingSeriesCreate, BookingSeriesResponse, SeriesConflict,
+    PriceQuoteItem, PriceQuote
+)
+from src.utils.validation import is_booking_conflict, describe_booking_conflict
+from src.utils.conflicts import (
+    ConflictReason, CONFLICT_MESSAGES, check_partner_conflicts, check_series_conflicts
+)
+from src.utils.recurrence import weekly_occurrences
+from src.utils.timeline import get_break_duration
+from src.utils.free_intervals import refresh_free_intervals
+from src.utils.holds import consume_hold
+from src.utils.pricing import price_booking, load_partner_pricing, get_partner_pricing
+from src.utils.notification import (
+    enqueue_booking_notifications, discard_pending_notifications
+)
 from src.utils.scheduler import validate_booking_time
 from src.schemas.enums import BookingType
 from src.schemas.schedule import ScheduleResponse
+from src.schemas.base import PageResponse
+from src.utils.pagination import keyset_page, decode_cursor, split_page
+from src.utils.loaders import BOOKING_RESPONSE
+from src.config.settings import settings
 
 class BookingService:
     @staticmethod
@@ -18,15 +38,17 @@ class BookingService:
         customer_id: int,
         booking: BookingCreate
     ) -> BookingResponse:
-        # Validate partner availability
-        is_available, message = validate_partner_availability(
+        # Fail fast on known conflicts and slots held by other customers,
+        # the overlap constraint still guards against concurrent requests
+        check = check_partner_conflicts(
             db,
             booking.partner_id,
             booking.start_datetime,
-            booking.end_datetime
+            booking.end_datetime,
+            customer_id=customer_id
         )
-        if not is_available:
-            raise ValueError(message)
+        if not check.is_available:
+            raise ValueError(check.message)
 
         # Calculate total price based on booking type and duration
         total_price = await BookingService.calculate_total_price(
@@ -50,14 +72,142 @@ class BookingService:
         )
         
         db.add(db_booking)
-        db.commit()
+        # The customer's hold on this slot becomes the booking
+        consume_hold(
+            db,
+            customer_id,
+            booking.partner_id,
+            booking.start_datetime,
+            booking.end_datetime
+        )
+        BookingService._commit_booking(db, db_booking)
         db.refresh(db_booking)
         
-        # Schedule notifications
-        schedule_booking_notifications(db, db_booking)
-        
         return BookingResponse.model_validate(db_booking)
 
+    @staticmethod
+    async def create_booking_series(
+        db: Session,
+        customer_id: int,
+        series: BookingSeriesCreate
+    ) -> BookingSeriesResponse:
+        """
+        Book every occurrence of a weekly series in one transaction. The
+        series is checked with one busy query and written with one bulk
+        insert per table, whatever its length.
+        """
+        partner = db.query(Partner).filter(Partner.id == series.partner_id).first()
+        if not partner or not partner.is_available:
+            raise ValueError(CONFLICT_MESSAGES[ConflictReason.PARTNER_UNAVAILABLE])
+
+        length = series.end_datetime - series.start_datetime
+        if series.occurrences > 1 and length + get_break_duration() > timedelta(weeks=series.interval_weeks):
+            raise ValueError("Occurrences of a series cannot overlap or skip the break between them")
+
+        occurrences = weekly_occurrences(
+            series.start_datetime,
+            series.end_datetime,
+            series.occurrences,
+            series.interval_weeks
+        )
+        reasons = check_series_conflicts(db, partner.id, occurrences)
+        conflicts = [
+            SeriesConflict(start_datetime=start, end_datetime=end, reason=CONFLICT_MESSAGES[reason])
+            for (start, end), reason in zip(occurrences, reasons)
+            if reason is not None
+        ]
+        free = [
+            occurrence for occurrence, reason in zip(occurrences, reasons)
+            if reason is None
+        ]
+        if conflicts and not series.allow_partial:
+            raise ValueError("Some occurrences are not available: " + ", ".join(
+                f"{conflict.start_datetime:%Y-%m-%d %H:%M} ({conflict.reason})"
+                for conflict in conflicts
+            ))
+        if not free:
+            return BookingSeriesResponse(bookings=[], conflicts=conflicts)
+
+        total_price = await BookingService.calculate_total_price(
+            db,
+            partner.id,
+            series.type,
+            series.start_datetime,
+            series.end_datetime
+        )
+
+        try:
+            bookings = db.scalars(
+                insert(Booking).returning(Booking),
+                [
+                    {
+                        "customer_id": customer_id,
+                        "partner_id": partner.id,
+                        "type": series.type,
+                        "start_datetime": start,
+                        "end_datetime": end,
+                        "status": BookingStatus.PENDING,
+                        "total_price": total_price,
+                        "notes": series.notes
+                    }
+                    for start, end in free
+                ]
+            ).all()
+            refresh_free_intervals(db, partner.id, free[0][0], free[-1][1])
+            enqueue_booking_notifications(db, bookings)
+            # Built before the commit expires the new rows
+            responses = [BookingResponse.model_validate(b) for b in bookings]
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if not is_booking_conflict(e):
+                raise
+            raise ValueError("Some occurrences were just booked by someone else, please try again")
+
+        return BookingSeriesResponse(bookings=responses, conflicts=conflicts)
+
+    @staticmethod
+    def _commit_booking(
+        db: Session,
+        booking: Booking,
+        replaced_booking: Optional[Booking] = None
+    ) -> None:
+        """
+        Commit a new booking together with the partner's free intervals and
+        its outbox notifications, in one transaction. Overlaps and missing
+        breaks are rejected by the bookings_no_overlap constraint and turned
+        into a ValueError.
+        """
+        replaced_booking_id = replaced_booking.id if replaced_booking else None
+        try:
+            refresh_free_intervals(
+                db,
+                booking.partner_id,
+                booking.start_datetime,
+                booking.end_datetime
+            )
+            if replaced_booking:
+                refresh_free_intervals(
+                    db,
+                    replaced_booking.partner_id,
+                    replaced_booking.start_datetime,
+                    replaced_booking.end_datetime
+                )
+                discard_pending_notifications(db, replaced_booking.id)
+            enqueue_booking_notifications(db, [booking])
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if not is_booking_conflict(e):
+                raise
+            raise ValueError(describe_booking_conflict(
+                db,
+                booking.partner_id,
+                booking.start_datetime,
+                booking.end_datetime,
+                exclude_booking_id=replaced_booking_id
+            ))
+
     @staticmethod
     async def calculate_total_price(
         db: Session,
@@ -66,28 +216,79 @@ class BookingService:
         start_datetime: datetime,
         end_datetime: datetime
     ) -> float:
-        partner = db.query(Partner).get(partner_id)
-        duration = end_datetime - start_datetime
-        
-        if booking_type == BookingType.HOURLY:
-            hours = duration.total_seconds() / 3600
-            return hours * partner.pricing['hourly_rate']
-        elif booking_type == BookingType.DAILY:
-            days = duration.days + (duration.seconds / 86400)
-            return days * partner.pricing['daily_rate']
-        else:  # MONTHLY
-            months = duration.days / 30
-            return months * partner.pricing['monthly_rate']
+        pricing = get_partner_pricing(db, partner_id)
+        if pricing is None:
+            raise ValueError(CONFLICT_MESSAGES[ConflictReason.PARTNER_UNAVAILABLE])
+        return price_booking(pricing, booking_type, start_datetime, end_datetime)
+
+    @staticmethod
+    async def quote_prices(
+        db: Session,
+        items: List[PriceQuoteItem]
+    ) -> List[PriceQuote]:
+        """Price many (partner, type, interval) options with one partner query"""
+        pricing = load_partner_pricing(
+            db,
+            [item.partner_id for item in items],
+            available_only=True
+        )
+        return [
+            PriceQuote(
+                **item.model_dump(),
+                total_price=(
+                    price_booking(
+                        pricing[item.partner_id],
+                        item.type,
+                        item.start_datetime,
+                        item.end_datetime
+                    )
+                    if item.partner_id in pricing else None
+                )
+            )
+            for item in items
+        ]
 
     @staticmethod
     async def get_customer_bookings(
         db: Session,
-        customer_id: int
-    ) -> List[BookingResponse]:
-        bookings = db.query(Booking).filter(
-            Booking.customer_id == customer_id
-        ).order_by(Booking.start_datetime.desc()).all()
-        return [BookingResponse.model_validate(b) for b in bookings]
+        customer_id: int,
+        cursor: Optional[str] = None,
+        limit: int = settings.DEFAULT_PAGE_SIZE,
+        status: Optional[BookingStatus] = None,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None
+    ) -> PageResponse[BookingResponse]:
+        """Customer's bookings, newest first, one keyset page at a time"""
+        query = db.query(Booking).filter(Booking.customer_id == customer_id)
+        if status:
+            query = query.filter(Booking.status == status)
+        if start_from:
+            query = query.filter(Booking.start_datetime >= start_from)
+        if start_to:
+            query = query.filter(Booking.start_datetime < start_to)
+        return BookingService._page(query, cursor, limit)
+
+    @staticmethod
+    def _page(
+        query: Query,
+        cursor: Optional[str],
+        limit: int
+    ) -> PageResponse[BookingResponse]:
+        """Page through bookings on (start_datetime, id), served by ix_bookings_customer_start_id"""
+        total = query.count()
+        bookings, next_cursor = keyset_page(
+            query.options(*BOOKING_RESPONSE),
+            Booking.start_datetime,
+            Booking.id,
+            cursor,
+            limit
+        )
+        return PageResponse[BookingResponse](
+            items=[BookingResponse.model_validate(b) for b in bookings],
+            total=total,
+            per_page=limit,
+            next_cursor=next_cursor
+        )
 
     @staticmethod
     async def cancel_booking(
@@ -109,6 +310,13 @@ class BookingService:
             
         booking.status = BookingStatus.CANCELLED
         booking.cancellation_reason = reason
+        discard_pending_notifications(db, booking.id)
+        refresh_free_intervals(
+            db,
+            booking.partner_id,
+            booking.start_datetime,
+            booking.end_datetime
+        )
         
         db.commit()
         db.refresh(booking)
@@ -131,16 +339,21 @@ class BookingService:
         if not booking:
             raise ValueError("Booking not found or cannot be rescheduled")
 
-        # Validate new schedule
-        is_available, message = validate_partner_availability(
+        check = check_partner_conflicts(
             db,
             booking.partner_id,
             new_start_datetime,
             new_end_datetime,
-            exclude_booking_id=booking_id
+            exclude_booking_id=booking_id,
+            customer_id=customer_id
         )
-        if not is_available:
-            raise ValueError(message)
+        if not check.is_available:
+            raise ValueError(check.message)
+
+        # Release the old slot first so the new booking does not clash with it
+        booking.status = BookingStatus.CANCELLED
+        booking.cancellation_reason = "Rescheduled"
+        db.flush()
 
         # Create new booking with reference to original
         new_booking = Booking(
@@ -156,48 +369,116 @@ class BookingService:
             original_booking_id=booking_id
         )
 
-        # Update old booking status
-        booking.status = BookingStatus.CANCELLED
-        booking.cancellation_reason = "Rescheduled"
-
         db.add(new_booking)
-        db.commit()
+        consume_hold(
+            db,
+            customer_id,
+            booking.partner_id,
+            new_start_datetime,
+            new_end_datetime
+        )
+        BookingService._commit_booking(db, new_booking, replaced_booking=booking)
         db.refresh(new_booking)
 
-        # Schedule new notifications
-        schedule_booking_notifications(db, new_booking)
-
         return BookingResponse.model_validate(new_booking)
 
     @staticmethod
     async def get_schedule_summary(
         db: Session,
-        customer_id: int
+        customer_id: int,
+        upcoming_cursor: Optional[str] = None,
+        past_cursor: Optional[str] = None,
+        cancelled_cursor: Optional[str] = None,
+        upcoming_limit: int = settings.DEFAULT_PAGE_SIZE,
+        past_limit: int = settings.DEFAULT_PAGE_SIZE,
+        cancelled_limit: int = settings.DEFAULT_PAGE_SIZE
     ) -> ScheduleResponse:
-        current_time = datetime.now()
-        
-        # Get upcoming bookings
-        upcoming = db.query(Booking).filter(
-            Booking.customer_id == customer_id,
-            Booking.start_datetime > current_time,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
-        ).order_by(Booking.start_datetime).all()
+        """
+        Upcoming, past and cancelled bookings in one round trip. Rows are
+        classified into sections with CASE, paged per section with
+        row_number() and loaded together with their partners.
+        """
+        now = datetime.now(timezone.utc)
+        # section -> (cursor, limit, newest first)
+        pages = {
+            "upcoming": (upcoming_cursor, upcoming_limit, False),
+            "past": (past_cursor, past_limit, True),
+            "cancelled": (cancelled_cursor, cancelled_limit, True)
+        }
 
-        # Get past bookings
-        past = db.query(Booking).filter(
-            Booking.customer_id == customer_id,
-            Booking.end_datetime <= current_time,
-            Booking.status == BookingStatus.COMPLETED
-        ).order_by(Booking.start_datetime.desc()).all()
+        section = case(
+            (and_(
+                Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+                Booking.start_datetime > now
+            ), "upcoming"),
+            (and_(
+                Booking.status == BookingStatus.COMPLETED,
+                Booking.end_datetime <= now
+            ), "past"),
+            (Booking.status == BookingStatus.CANCELLED, "cancelled")
+        )
+        classified = select(
+            Booking.id,
+            Booking.start_datetime,
+            section.label("section"),
+            func.count().over(partition_by=section).label("total")
+        ).where(Booking.customer_id == customer_id).subquery()
 
-        # Get cancelled bookings
-        cancelled = db.query(Booking).filter(
-            Booking.customer_id == customer_id,
-            Booking.status == BookingStatus.CANCELLED
-        ).order_by(Booking.start_datetime.desc()).all()
+        # Rows after each section's cursor
+        key = tuple_(classified.c.start_datetime, classified.c.id)
+        in_page = []
+        for name, (cursor, _, descending) in pages.items():
+            condition = classified.c.section == name
+            if cursor:
+                after = tuple_(*decode_cursor(cursor))
+                condition = and_(condition, key < after if descending else key > after)
+            in_page.append(condition)
+
+        position = case(
+            (classified.c.section == "upcoming", func.row_number().over(
+                partition_by=classified.c.section,
+                order_by=(classified.c.start_datetime.asc(), classified.c.id.asc())
+            )),
+            else_=func.row_number().over(
+                partition_by=classified.c.section,
+                order_by=(classified.c.start_datetime.desc(), classified.c.id.desc())
+            )
+        )
+        ranked = select(
+            classified.c.id,
+            classified.c.section,
+            classified.c.total,
+            position.label("position")
+        ).where(or_(*in_page)).subquery()
+
+        # One extra row per section tells whether it has a next page
+        section_limit = case(
+            *[(ranked.c.section == name, limit + 1) for name, (_, limit, _) in pages.items()]
+        )
+        rows = db.query(Booking, ranked.c.section, ranked.c.total).join(
+            ranked, Booking.id == ranked.c.id
+        ).filter(
+            ranked.c.position <= section_limit
+        ).options(*BOOKING_RESPONSE).order_by(ranked.c.section, ranked.c.position).all()
+
+        bookings = {name: [] for name in pages}
+        totals = dict.fromkeys(pages, 0)
+        for booking, name, total in rows:
+            bookings[name].append(booking)
+            totals[name] = total
+
+        sections = {}
+        for name, (_, limit, _) in pages.items():
+            items, next_cursor = split_page(bookings[name], limit, "start_datetime")
+            sections[name] = PageResponse[BookingResponse](
+                items=[BookingResponse.model_validate(b) for b in items],
+                total=totals[name],
+                per_page=limit,
+                next_cursor=next_cursor
+            )
 
         return ScheduleResponse(
-            upcoming_bookings=[BookingResponse.model_validate(b) for b in upcoming],
-            past_bookings=[BookingResponse.model_validate(b) for b in past],
-            cancelled_bookings=[BookingResponse.model_validate(b) for b in cancelled]
-        )
\ No newline at end of file
+            upcoming_bookings=sections["upcoming"],
+            past_bookings=sections["past"],
+            cancelled_bookings=sections["cancelled"]
+        )
@@ -0,0 +1,76 @@
+# src/services/hold_service.py
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from src.models.partner import Partner
+from src.models.slot_hold import SlotHold
+from src.schemas.booking import SlotHoldCreate, SlotHoldResponse
+from src.utils.conflicts import check_partner_conflicts
+from src.utils.holds import sweep_expired_holds
+from src.config.settings import settings
+
+class HoldService:
+    @staticmethod
+    async def create_hold(
+        db: Session,
+        customer_id: int,
+        hold: SlotHoldCreate
+    ) -> SlotHoldResponse:
+        """
+        Reserve a partner's slot for SLOT_HOLD_MINUTES while the customer
+        checks out. Holds of the same partner are serialized on the partner
+        row, so only one of several customers racing for a slot gets it.
+        """
+        if hold.end_datetime <= hold.start_datetime:
+            raise ValueError("End time must be after start time")
+
+        partner = db.query(Partner).filter(
+            Partner.id == hold.partner_id
+        ).with_for_update().first()
+        if not partner:
+            raise ValueError("Partner not found or unavailable")
+
+        sweep_expired_holds(db, partner.id)
+        # A customer holds one slot per partner at a time
+        db.execute(delete(SlotHold).where(
+            SlotHold.customer_id == customer_id,
+            SlotHold.partner_id == partner.id
+        ))
+
+        check = check_partner_conflicts(
+            db,
+            partner.id,
+            hold.start_datetime,
+            hold.end_datetime,
+            customer_id=customer_id
+        )
+        if not check.is_available:
+            db.rollback()
+            raise ValueError(check.message)
+
+        db_hold = SlotHold(
+            partner_id=partner.id,
+            customer_id=customer_id,
+            start_datetime=hold.start_datetime,
+            end_datetime=hold.end_datetime,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.SLOT_HOLD_MINUTES)
+        )
+        db.add(db_hold)
+        db.commit()
+        db.refresh(db_hold)
+        return SlotHoldResponse.model_validate(db_hold)
+
+    @staticmethod
+    async def release_hold(
+        db: Session,
+        customer_id: int,
+        hold_id: int
+    ) -> None:
+        released = db.execute(delete(SlotHold).where(
+            SlotHold.id == hold_id,
+            SlotHold.customer_id == customer_id
+        )).rowcount
+        if not released:
+            db.rollback()
+            raise ValueError("Hold not found")
+        db.commit()
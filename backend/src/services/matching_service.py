@@ -1,65 +1,44 @@
 # src/services/matching_service.py
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, timedelta
-from src.models.partner import Partner
-from src.models.booking import Booking
-from src.schemas.booking import BookingStatus
-from src.schemas.matching import MatchRequest, MatchResponse
+from datetime import timedelta
+from src.schemas.matching import MatchRequest
 from src.schemas.partner import PartnerResponse
-from src.schemas.schedule import TimeSlot
-from src.utils.matching import calculate_matching_score
+from src.utils.catalog import get_partner_catalog
+from src.utils.conflicts import find_busy_partner_ids
+from src.utils.matching import ScoreColumns, batch_matching_scores, rank_by_score
 
 class MatchingService:
     @staticmethod
     async def find_matches(
         db: Session,
         request: MatchRequest,
-        customer_preferences: Optional[dict] = None
+        customer_preferences: Optional[dict] = None,
+        customer_id: Optional[int] = None
     ) -> List[PartnerResponse]:
-        # Base query for partners
-        query = db.query(Partner).filter(
-            Partner.kecamatan == request.kecamatan,
-            Partner.role == request.role,
-            Partner.is_active == True
+        # Candidates of the requested role come from the partner catalog
+        filters = request.filters.model_copy(update={"role": request.role})
+        partners = [
+            p for p in get_partner_catalog(db).search(request.kecamatan, filters)
+            if p.is_available
+        ]
+        if not partners:
+            return []
+
+        # Drop every partner busy in the requested window with one query,
+        # the requester's own holds aside
+        end_datetime = request.end_datetime or request.start_datetime + timedelta(hours=1)
+        busy_ids = find_busy_partner_ids(
+            db, [p.id for p in partners], request.start_datetime, end_datetime, customer_id
         )
-        
-        # Apply filters from request
-        if request.filters:
-            if request.filters.min_rating:
-                query = query.filter(Partner.rating >= request.filters.min_rating)
-            if request.filters.min_experience:
-                query = query.filter(Partner.experience_years >= request.filters.min_experience)
-            if request.filters.max_hourly_rate:
-                query = query.filter(Partner.pricing['hourly_rate'] <= request.filters.max_hourly_rate)
-            if request.filters.specialization:
-                query = query.filter(Partner.specializations.contains([request.filters.specialization]))
-        
-        # Get available partners
-        available_partners = []
-        partners = query.all()
-        
-        for partner in partners:
-            # Check availability for requested time
-            is_available = await ScheduleService.check_partner_availability(
-                db,
-                partner.id,
-                request.start_datetime,
-                request.start_datetime + timedelta(hours=1)  # Check initial hour
-            )
-            
-            if is_available:
-                score = calculate_matching_score(partner, request, customer_preferences or {})
-                available_partners.append((partner, score))
-        
-        # Sort by matching score
-        available_partners.sort(key=lambda x: x[1], reverse=True)
-        
-        # Convert to response objects
+        partners = [p for p in partners if p.id not in busy_ids]
+
+        # Score the remaining partners at once, best first
+        scores = batch_matching_scores(ScoreColumns.load(db, partners, request.start_datetime))
         return [
             PartnerResponse(
-                **PartnerResponse.model_validate(p[0]).model_dump(),
-                matching_score=score
+                **partners[i].model_dump(),
+                matching_score=float(scores[i])
             )
-            for p, score in available_partners
-        ]
\ No newline at end of file
+            for i in rank_by_score(scores)
+        ]
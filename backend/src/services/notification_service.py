@@ -3,6 +3,7 @@ from typing import List
 from sqlalchemy.orm import Session
 from src.models.notification import Notification
 from src.schemas.notification import NotificationResponse
+from src.utils.loaders import NOTIFICATION_RESPONSE
 
 class NotificationService:
     @staticmethod
@@ -18,7 +19,7 @@ class NotificationService:
         if unread_only:
             query = query.filter(Notification.is_read == False)
             
-        notifications = query.order_by(
+        notifications = query.options(*NOTIFICATION_RESPONSE).order_by(
             Notification.created_at.desc()
         ).all()
         
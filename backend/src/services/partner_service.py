@@ -1,25 +1,41 @@
 # src/services/partner_service.py
+from collections import defaultdict
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from src.models.partner import Partner
+from src.models.booking import Booking
 from src.schemas.partner import PartnerResponse, PartnerFilter
-from src.schemas.matching import MatchRequest
+from src.schemas.matching import MatchRequest, MatchSortCriteria, EarliestSlotResponse
+from src.schemas.enums import BookingType, PartnerRole
 from src.schemas.booking import BookingStatus
-from src.utils.matching import match_partners, calculate_matching_score
-from datetime import datetime
+from src.utils.matching import (
+    match_partners, ScoreColumns, batch_matching_scores, top_k, SORT_KEYS
+)
+from src.utils.timeline import BusyTimeline, as_aware, earliest_fits, get_break_duration
+from src.utils.recurrence import LOCAL_TIMEZONE, get_rule_blocked_intervals
+from src.utils.availability import build_busy_timelines
+from src.utils.catalog import get_partner_catalog
+from src.utils.holds import get_active_holds
+from src.config.settings import settings
+from datetime import datetime, timedelta, timezone
 from src.models.partner_availability import PartnerAvailability as PartnerAvailabilityModels
-from src.schemas.schedule import PartnerAvailability as PartnerAvailabilitySchemas
+from src.schemas.schedule import PartnerAvailability as PartnerAvailabilitySchemas, TimeSlot
 
 class PartnerService:
     @staticmethod
     async def get_partners(
         db: Session,
         kecamatan: str,
-        filters: Optional[PartnerFilter] = None
+        filters: Optional[PartnerFilter] = None,
+        sort_by: Optional[MatchSortCriteria] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[PartnerResponse]:
         try:
             partners = match_partners(db, kecamatan, filters, datetime.now())
-            return [PartnerResponse.model_validate(p) for p in partners]
+            if sort_by in SORT_KEYS:
+                return top_k(partners, SORT_KEYS[sort_by], limit, offset)
+            return partners[offset:offset + limit if limit else None]
         except Exception as e:
             logger.error(f"Error in get_partners: {str(e)}")
             raise
@@ -38,36 +54,45 @@ class PartnerService:
     async def search_partners(
         db: Session,
         request: MatchRequest,
-        customer_preferences: Optional[dict] = None
+        customer_preferences: Optional[dict] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        customer_id: Optional[int] = None
     ) -> List[PartnerResponse]:
         # Get initial matches based on basic criteria
         partners = match_partners(
             db,
             request.kecamatan,
             request.filters,
-            request.start_datetime
+            request.start_datetime,
+            available_between=(
+                (request.start_datetime, request.end_datetime)
+                if request.end_datetime else None
+            ),
+            customer_id=customer_id
         )
         
-        # Calculate matching scores and sort
-        scored_partners = []
-        for partner in partners:
-            score = calculate_matching_score(
-                partner,
-                request,
-                customer_preferences or {}
+        if request.sort_by in SORT_KEYS:
+            # Pick the page by the attribute, then score only that page
+            partners = top_k(partners, SORT_KEYS[request.sort_by], limit, offset)
+            scores = batch_matching_scores(
+                ScoreColumns.load(db, partners, request.start_datetime)
             )
-            scored_partners.append((partner, score))
-            
-        # Sort by score descending
-        scored_partners.sort(key=lambda x: x[1], reverse=True)
+            ranked = range(len(partners))
+        else:
+            # Score every candidate at once and keep the best page
+            scores = batch_matching_scores(
+                ScoreColumns.load(db, partners, request.start_datetime)
+            )
+            ranked = top_k(range(len(partners)), scores.__getitem__, limit, offset)
         
         # Return partner responses with scores
         return [
             PartnerResponse(
-                **PartnerResponse.model_validate(p[0]).model_dump(),
-                matching_score=p[1]
+                **PartnerResponse.model_validate(partners[i]).model_dump(),
+                matching_score=float(scores[i])
             )
-            for p in scored_partners
+            for i in ranked
         ]
 
     @staticmethod
@@ -77,47 +102,195 @@ class PartnerService:
         start_date: datetime,
         end_date: datetime
     ) -> PartnerAvailabilitySchemas:
-        # Get all bookings in the date range
+        availabilities = await PartnerService.get_partners_availability(
+            db,
+            [partner_id],
+            start_date,
+            end_date
+        )
+        return availabilities[0]
+
+    @staticmethod
+    async def get_partners_availability(
+        db: Session,
+        partner_ids: List[int],
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[PartnerAvailabilitySchemas]:
+        """Availability of many partners with one query per table"""
+        partner_ids = list(dict.fromkeys(partner_ids))
+        cooldown = get_break_duration()
+
+        # Get all bookings in the date range, grouped per partner
+        bookings_by_partner = defaultdict(list)
         bookings = db.query(Booking).filter(
-            Booking.partner_id == partner_id,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
-            Booking.start_datetime <= end_date,
-            Booking.end_datetime >= start_date
+            Booking.partner_id.in_(partner_ids),
+            Booking.status != BookingStatus.CANCELLED,
+            Booking.start_datetime <= end_date + cooldown,
+            Booking.end_datetime >= start_date - cooldown
         ).all()
+        # Slots held by customers at checkout are taken as well
+        bookings += get_active_holds(db, partner_ids, start_date, end_date)
+        for booking in bookings:
+            bookings_by_partner[booking.partner_id].append(booking)
 
-        # Get blocked time slots
+        # Get blocked time slots, grouped per partner
+        blocked_by_partner = defaultdict(list)
         blocked_slots = db.query(PartnerAvailabilityModels).filter(
-            PartnerAvailabilityModels.partner_id == partner_id,
+            PartnerAvailabilityModels.partner_id.in_(partner_ids),
             PartnerAvailabilityModels.start_time <= end_date,
             PartnerAvailabilityModels.end_time >= start_date,
             PartnerAvailabilityModels.is_blocked == True
-        ).all()
+        ).order_by(PartnerAvailabilityModels.start_time).all()
+        for slot in blocked_slots:
+            blocked_by_partner[slot.partner_id].append((slot.start_time, slot.end_time))
+
+        # Windows blocked by recurring availability rules
+        for partner_id, intervals in get_rule_blocked_intervals(
+            db, partner_ids, start_date, end_date
+        ).items():
+            blocked_by_partner[partner_id].extend(intervals)
+
+        return [
+            PartnerAvailabilitySchemas(
+                partner_id=partner_id,
+                available_slots=PartnerService._business_hour_slots(
+                    BusyTimeline.from_bookings(
+                        bookings_by_partner[partner_id],
+                        cooldown=cooldown,
+                        blocked_intervals=blocked_by_partner[partner_id]
+                    ),
+                    start_date,
+                    end_date
+                ),
+                blocked_slots=[TimeSlot(
+                    start_time=slot_start,
+                    end_time=slot_end,
+                    is_available=False
+                ) for slot_start, slot_end in sorted(blocked_by_partner[partner_id])]
+            )
+            for partner_id in partner_ids
+        ]
+
+    @staticmethod
+    def _business_hour_slots(
+        timeline: BusyTimeline,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[TimeSlot]:
+        """Free one-hour slots during business hours (8 AM - 8 PM)"""
+        hour = timedelta(hours=1)
+        return [
+            TimeSlot(start_time=slot_start, end_time=slot_end, is_available=True)
+            for slot_start, slot_end in timeline.free_slots(
+                start_date,
+                end_date,
+                lambda current: (current + hour, current + hour)
+            )
+            if 8 <= slot_start.hour < 20
+        ]
+
+    @staticmethod
+    async def find_earliest_slots(
+        db: Session,
+        kecamatan: str,
+        role: PartnerRole,
+        booking_type: BookingType,
+        duration: int,
+        k: int,
+        after: Optional[datetime] = None,
+        customer_id: Optional[int] = None
+    ) -> List[EarliestSlotResponse]:
+        """
+        Soonest slot of the given length across every available partner in
+        the kecamatan. The k earliest partners (plus the ones tied with the
+        last of them) are ranked by start time, then by matching score.
+        """
+        length = PartnerService._slot_length(booking_type, duration)
+        start = as_aware(after or datetime.now(timezone.utc))
+        end = start + timedelta(days=settings.EARLIEST_SLOT_SEARCH_DAYS)
+
+        catalog = get_partner_catalog(db)
+        partner_ids = [
+            partner.id
+            for partner in catalog.search(kecamatan, PartnerFilter(role=role))
+            if partner.is_available
+        ]
+        if not partner_ids:
+            return []
+
+        # One busy query for all candidates, then a k-way merge of their gaps.
+        # The requester's own holds do not hide their slots.
+        timelines = build_busy_timelines(
+            db, partner_ids, start, end + length, customer_id=customer_id
+        )
+        picked = []
+        for slot_start, partner_id in earliest_fits(
+            timelines,
+            start,
+            end,
+            length,
+            lambda value: PartnerService._align_slot_start(booking_type, length, value)
+        ):
+            if len(picked) >= k and slot_start > picked[-1][0]:
+                break
+            picked.append((slot_start, partner_id))
+        if not picked:
+            return []
+
+        scores = batch_matching_scores(ScoreColumns.load(
+            db,
+            [catalog.get(partner_id) for _, partner_id in picked],
+            [slot_start for slot_start, _ in picked]
+        ))
+        results = [
+            EarliestSlotResponse(
+                partner=catalog.get(partner_id),
+                start_datetime=slot_start,
+                end_datetime=slot_start + length,
+                matching_score=float(score)
+            )
+            for (slot_start, partner_id), score in zip(picked, scores)
+        ]
+
+        results.sort(key=lambda r: (r.start_datetime, -r.matching_score))
+        return results[:k]
+
+    @staticmethod
+    def _slot_length(booking_type: BookingType, duration: int) -> timedelta:
+        """Length of a booking of `duration` hours, days or months"""
+        if duration < 1:
+            raise ValueError("Duration must be at least 1")
+        if booking_type == BookingType.HOURLY:
+            if duration > settings.MAX_HOURLY_DURATION:
+                raise ValueError(f"Hourly bookings cannot exceed {settings.MAX_HOURLY_DURATION} hours")
+            return timedelta(hours=duration)
+        if booking_type == BookingType.DAILY:
+            if duration > settings.MAX_DAILY_DURATION:
+                raise ValueError(f"Daily bookings cannot exceed {settings.MAX_DAILY_DURATION} days")
+            # 8 AM on the first day until 8 PM on the last one
+            return timedelta(days=duration - 1, hours=12)
+        if duration > settings.MAX_MONTHLY_DURATION:
+            raise ValueError(f"Monthly bookings cannot exceed {settings.MAX_MONTHLY_DURATION} months")
+        return timedelta(days=30 * duration - 1, hours=12)
+
+    @staticmethod
+    def _align_slot_start(
+        booking_type: BookingType,
+        length: timedelta,
+        value: datetime
+    ) -> datetime:
+        """First allowed slot start at or after value, in local business hours (8 AM - 8 PM)"""
+        local = value.astimezone(LOCAL_TIMEZONE)
+        if booking_type != BookingType.HOURLY:
+            opening = local.replace(hour=8, minute=0, second=0, microsecond=0)
+            return opening if local <= opening else opening + timedelta(days=1)
 
-        # Calculate available slots
-        available_slots = []
-        current = start_date
-        while current < end_date:
-            if 8 <= current.hour < 20:  # Business hours check
-                slot_end = current + timedelta(hours=1)
-                is_available = not any(
-                    (b.start_datetime <= current < b.end_datetime) or
-                    (b.start_datetime < slot_end <= b.end_datetime)
-                    for b in bookings
-                )
-                if is_available:
-                    available_slots.append(TimeSlot(
-                        start_time=current,
-                        end_time=slot_end,
-                        is_available=True
-                    ))
-            current += timedelta(hours=1)
-
-        return PartnerAvailabilitySchemas(
-            partner_id=partner_id,
-            available_slots=available_slots,
-            blocked_slots=[TimeSlot(
-                start_time=slot.start_time,
-                end_time=slot.end_time,
-                is_available=False
-            ) for slot in blocked_slots]
-        )
\ No newline at end of file
+        if local.minute or local.second or local.microsecond:
+            local = local.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        opening = local.replace(hour=8)
+        if local < opening:
+            return opening
+        if local + length <= local.replace(hour=20):
+            return local
+        return opening + timedelta(days=1)
@@ -0,0 +1,73 @@
+# src/services/recommendation_service.py
+from math import ceil
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+from sqlalchemy.orm import Session
+from src.schemas.enums import PartnerRole
+from src.schemas.partner import PartnerResponse
+from src.utils.catalog import get_partner_catalog
+from src.utils.matching import ScoreColumns, batch_matching_scores, top_k
+
+class RecommendationService:
+    @staticmethod
+    async def recommend_partners(
+        db: Session,
+        kecamatan: str,
+        roles: Sequence[PartnerRole],
+        preferences: dict,
+        limit: int = 5
+    ) -> List[PartnerResponse]:
+        """
+        Best scored partners over several roles. Each role gets an equal share
+        of `limit` among the partners within the customer's rating and price
+        preferences; unfilled places go to the best remaining partners with
+        those preferences relaxed. Candidates of every role come from the
+        partner catalog and are scored in one pass, one query in total.
+        """
+        # Roles from stored preferences are plain strings
+        roles = list(dict.fromkeys(PartnerRole(role) for role in roles))
+        min_rating = preferences.get('min_rating', 0)
+        max_hourly_rate = preferences.get('max_price_per_hour')
+        candidates = get_partner_catalog(db).search(kecamatan, roles=roles)
+        scores = batch_matching_scores(
+            ScoreColumns.load(db, candidates, datetime.now(timezone.utc))
+        )
+
+        # Candidates of each role, best score first
+        ranked: Dict[PartnerRole, List[int]] = {role: [] for role in roles}
+        for i in top_k(range(len(candidates)), scores.__getitem__):
+            ranked[candidates[i].role].append(i)
+
+        def within_preferences(i: int) -> bool:
+            partner = candidates[i]
+            if min_rating and partner.rating < min_rating:
+                return False
+            if max_hourly_rate and partner.pricing.hourly_rate > max_hourly_rate:
+                return False
+            return True
+
+        # Calculate partners per role (total divided by number of roles)
+        partners_per_role = max(1, ceil(limit / len(roles)))
+        picked = []
+        for role in roles:
+            picked.extend([i for i in ranked[role] if within_preferences(i)][:partners_per_role])
+
+        # Relax rating and price requirements to fill the remaining places
+        if len(picked) < limit:
+            additional_per_role = ceil((limit - len(picked)) / len(roles))
+            for role in roles:
+                if len(picked) >= limit:
+                    break
+                included = set(picked)
+                picked.extend([i for i in ranked[role] if i not in included][:additional_per_role])
+
+        recommended = [
+            PartnerResponse(
+                **candidates[i].model_dump(),
+                matching_score=float(scores[i])
+            )
+            for i in picked
+        ]
+        # Sort combined results by rating and limit
+        recommended.sort(key=lambda p: p.rating, reverse=True)
+        return recommended[:limit]
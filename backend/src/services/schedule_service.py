@@ -3,9 +3,14 @@ from sqlalchemy.orm import Session
 from typing import List, Tuple
 from datetime import datetime, timedelta
 from src.models.booking import Booking
+from src.models.partner_availability import PartnerAvailability
 from src.schemas.booking import BookingStatus
 from src.schemas.schedule import TimeSlot
 from src.schemas.booking import BookingType
+from src.utils.timeline import BusyTimeline, get_break_duration
+from src.utils.conflicts import check_partner_conflicts
+from src.utils.recurrence import get_rule_blocked_intervals
+from src.utils.holds import get_active_holds
 
 class ScheduleService:
     @staticmethod
@@ -16,61 +21,62 @@ class ScheduleService:
         end_date: datetime,
         booking_type: BookingType
     ) -> List[TimeSlot]:
-        # Get existing bookings
+        start_date = start_date.astimezone()
+        end_date = end_date.astimezone()
+        cooldown = get_break_duration()
+        # Slots starting before end_date may run past it
+        horizon, _ = ScheduleService._next_slot(booking_type, end_date)
+
+        # Get existing bookings, including the ones whose cooldown reaches the range
         existing_bookings = db.query(Booking).filter(
             Booking.partner_id == partner_id,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
-            Booking.start_datetime < end_date,
-            Booking.end_datetime > start_date
+            Booking.status != BookingStatus.CANCELLED,
+            Booking.start_datetime < horizon + cooldown,
+            Booking.end_datetime > start_date - cooldown
         ).all()
-        
-        # Generate all possible slots
-        all_slots = []
-        current = start_date
-        
-        while current < end_date:
-            # Only consider slots during business hours (8 AM - 8 PM)
-            if 1 == 1:
-                if booking_type == BookingType.HOURLY:
-                    slot_end = current + timedelta(hours=1)
-                elif booking_type == BookingType.DAILY:
-                    slot_end = (current + timedelta(days=1)).replace(hour=20, minute=0)
-                else:  # MONTHLY
-                    slot_end = (current + timedelta(days=30)).replace(hour=20, minute=0)
-                
-                is_available = True
-                
-                # Check for conflicts with existing bookings
-                for booking in existing_bookings:
-                    if (booking.start_datetime <= current < booking.end_datetime or
-                        booking.start_datetime < slot_end <= booking.end_datetime):
-                        is_available = False
-                        break
-                
-                # Add buffer time after each booking
-                if is_available and booking_type == BookingType.HOURLY:
-                    buffer_end = slot_end + timedelta(hours=1)
-                    for booking in existing_bookings:
-                        if (booking.start_datetime <= buffer_end <= booking.end_datetime):
-                            is_available = False
-                            break
-                
-                if is_available:
-                    all_slots.append(TimeSlot(
-                        start_time=current,
-                        end_time=slot_end,
-                        is_available=True
-                    ))
-            
-            # Increment based on booking type
-            if booking_type == BookingType.HOURLY:
-                current += timedelta(hours=1)
-            elif booking_type == BookingType.DAILY:
-                current += timedelta(days=1)
-            else:  # MONTHLY
-                current += timedelta(days=30)
-        
-        return all_slots
+        # Slots held by customers at checkout are taken as well
+        existing_bookings += get_active_holds(db, [partner_id], start_date, horizon)
+
+        # Get blocked time slots
+        blocked_slots = db.query(PartnerAvailability).filter(
+            PartnerAvailability.partner_id == partner_id,
+            PartnerAvailability.is_blocked == True,
+            PartnerAvailability.start_time < horizon,
+            PartnerAvailability.end_time > start_date
+        ).all()
+
+        # Windows blocked by recurring availability rules
+        rule_blocked = get_rule_blocked_intervals(db, [partner_id], start_date, horizon)
+
+        timeline = BusyTimeline.from_bookings(
+            existing_bookings,
+            blocked_slots,
+            cooldown,
+            blocked_intervals=rule_blocked.get(partner_id, [])
+        )
+
+        return [
+            TimeSlot(start_time=slot_start, end_time=slot_end, is_available=True)
+            for slot_start, slot_end in timeline.free_slots(
+                start_date,
+                end_date,
+                lambda current: ScheduleService._next_slot(booking_type, current)
+            )
+        ]
+
+    @staticmethod
+    def _next_slot(
+        booking_type: BookingType,
+        current: datetime
+    ) -> Tuple[datetime, datetime]:
+        """Return (slot_end, next_slot_start) for a slot starting at current"""
+        if booking_type == BookingType.HOURLY:
+            slot_end = current + timedelta(hours=1)
+            return slot_end, slot_end
+        elif booking_type == BookingType.DAILY:
+            return (current + timedelta(days=1)).replace(hour=20, minute=0), current + timedelta(days=1)
+        else:  # MONTHLY
+            return (current + timedelta(days=30)).replace(hour=20, minute=0), current + timedelta(days=30)
 
     @staticmethod
     async def check_partner_availability(
@@ -79,26 +85,7 @@ class ScheduleService:
         start_time: datetime,
         end_time: datetime
     ) -> bool:
-        # Check if there are any overlapping bookings
-        start_time = start_time.astimezone()
-        end_time = end_time.astimezone()
-        overlapping = db.query(Booking).filter(
-            Booking.partner_id == partner_id,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
-            Booking.start_datetime < end_time,
-            Booking.end_datetime > start_time
-        ).first()
-            
-        # Check buffer time
-        buffer_end = end_time + timedelta(hours=1)
-        buffer_conflict = db.query(Booking).filter(
-            Booking.partner_id == partner_id,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
-            Booking.start_datetime <= buffer_end,
-            Booking.end_datetime > end_time
-        ).first()
-        
-        return not (overlapping or buffer_conflict)
+        return check_partner_conflicts(db, partner_id, start_time, end_time).is_available
 
     @staticmethod
     async def validate_booking_duration(
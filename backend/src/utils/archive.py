@@ -0,0 +1,144 @@
+# src/utils/archive.py
+from datetime import date, datetime, timezone
+from typing import Iterator, List, Optional
+from sqlalchemy import DDL, select, insert, delete, exists, func, table, column, text
+from sqlalchemy.orm import Session
+from src.models.booking import Booking
+from src.models.customer import Customer
+from src.models.notification import Notification
+from src.models.notification_outbox import NotificationOutbox
+from src.models.review import Review
+from src.schemas.booking import BookingStatus
+from src.config.settings import settings
+
+# Finished bookings and their notifications are moved to archive tables
+# partitioned by month. bookings itself cannot be partitioned: Postgres
+# needs the partition key in every unique and exclusion constraint, which
+# rules out the overlap constraint and the foreign keys to bookings.id.
+ARCHIVE_TABLES = ("bookings_archive", "notifications_archive")
+
+ARCHIVE_DDL = [
+    DDL(
+        "CREATE TABLE IF NOT EXISTS bookings_archive (LIKE bookings) "
+        "PARTITION BY RANGE (start_datetime)"
+    ),
+    DDL(
+        "CREATE TABLE IF NOT EXISTS notifications_archive (LIKE notifications) "
+        "PARTITION BY RANGE (scheduled_for)"
+    ),
+]
+
+bookings_archive = table(
+    "bookings_archive",
+    *[column(c.name) for c in Booking.__table__.columns]
+)
+notifications_archive = table(
+    "notifications_archive",
+    *[column(c.name) for c in Notification.__table__.columns]
+)
+
+def month_starts(first: datetime, last: datetime) -> Iterator[date]:
+    """First day of every month from first's month through last's, in UTC"""
+    first, last = first.astimezone(timezone.utc), last.astimezone(timezone.utc)
+    month = date(first.year, first.month, 1)
+    while month <= last.date():
+        yield month
+        month = _next_month(month)
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def partition_name(archive: str, month: date) -> str:
+    return f"{archive}_{month:%Y_%m}"
+
+def ensure_archive_partitions(
+    db: Session,
+    archive: str,
+    first: datetime,
+    last: datetime
+) -> None:
+    """Create the monthly partitions of an archive table covering [first, last]"""
+    for month in month_starts(first, last):
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(archive, month)} "
+            f"PARTITION OF {archive} FOR VALUES "
+            f"FROM ('{month.isoformat()} 00:00+00') TO ('{_next_month(month).isoformat()} 00:00+00')"
+        ))
+
+def archive_finished_bookings(
+    db: Session,
+    before: datetime,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Move one batch of completed and cancelled bookings that ended before
+    `before` to bookings_archive, together with their notifications.
+    Only bookings of deactivated customers are moved: the booking lists,
+    schedule, notifications and dashboard read the live tables and serve
+    active customers only, so their history must stay there. Reviewed
+    bookings stay too, partner reviews still point at them. The caller
+    commits.
+    """
+    booking_ids = db.execute(
+        select(Booking.id).join(
+            Customer, Customer.id == Booking.customer_id
+        ).where(
+            Customer.is_active == False,
+            Booking.status.in_([BookingStatus.COMPLETED, BookingStatus.CANCELLED]),
+            Booking.end_datetime < before,
+            ~exists().where(Review.booking_id == Booking.id),
+            ~exists().where(NotificationOutbox.booking_id == Booking.id)
+        ).order_by(
+            Booking.id
+        ).limit(
+            batch_size or settings.BOOKING_ARCHIVE_BATCH
+        ).with_for_update(skip_locked=True, of=Booking)
+    ).scalars().all()
+    if not booking_ids:
+        return 0
+
+    first, last = db.execute(
+        select(func.min(Booking.start_datetime), func.max(Booking.start_datetime))
+        .where(Booking.id.in_(booking_ids))
+    ).one()
+    ensure_archive_partitions(db, "bookings_archive", first, last)
+    first, last = db.execute(
+        select(func.min(Notification.scheduled_for), func.max(Notification.scheduled_for))
+        .where(Notification.booking_id.in_(booking_ids))
+    ).one()
+    if first is not None:
+        ensure_archive_partitions(db, "notifications_archive", first, last)
+
+    # Notifications first, they reference the bookings
+    for model, archive, condition in (
+        (Notification, notifications_archive, Notification.booking_id.in_(booking_ids)),
+        (Booking, bookings_archive, Booking.id.in_(booking_ids)),
+    ):
+        columns = [c.name for c in model.__table__.columns]
+        moved = delete(model).where(condition).returning(
+            *model.__table__.columns
+        ).cte("moved")
+        db.execute(
+            insert(archive).from_select(columns, select(*[moved.c[name] for name in columns])),
+            execution_options={"synchronize_session": False}
+        )
+    return len(booking_ids)
+
+def detach_archive_partitions(db: Session, before: date) -> List[str]:
+    """
+    Detach the archive partitions of months before `before`. They are left
+    as standalone tables to dump and drop. The caller commits.
+    """
+    detached = []
+    for archive in ARCHIVE_TABLES:
+        partitions = db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :archive ORDER BY child.relname"
+        ), {"archive": archive}).scalars().all()
+        for partition in partitions:
+            if partition < partition_name(archive, before):
+                db.execute(text(f"ALTER TABLE {archive} DETACH PARTITION {partition}"))
+                detached.append(partition)
+    return detached
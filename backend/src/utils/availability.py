@@ -0,0 +1,231 @@
+# src/utils/availability.py
+from collections import defaultdict
+from datetime import datetime, timedelta
+from math import ceil
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+from sqlalchemy import select, union_all, literal
+from sqlalchemy.orm import Session
+from src.models.booking import Booking
+from src.models.partner_availability import PartnerAvailability
+from src.models.slot_hold import SlotHold
+from src.schemas.booking import BookingStatus
+from src.config.settings import settings
+from .timeline import BusyTimeline, as_aware, get_break_duration
+from .recurrence import get_rule_blocked_intervals
+from .holds import active_hold_filters
+
+class BusyRow(NamedTuple):
+    partner_id: int
+    start: datetime
+    end: datetime
+    is_booking: bool
+
+class AvailabilityMatrix:
+    """
+    Busy/free bitmap of many partners, one row per partner and one column
+    per AVAILABILITY_BUCKET_MINUTES bucket.
+
+    Booking edges are rounded outwards to whole buckets, so a window is only
+    reported free when every bucket it touches is free.
+    """
+
+    def __init__(
+        self,
+        partner_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        bucket: Optional[timedelta] = None
+    ):
+        self.bucket = bucket or timedelta(minutes=settings.AVAILABILITY_BUCKET_MINUTES)
+        self.partner_ids = np.asarray(partner_ids, dtype=np.int64)
+        self.row_index: Dict[int, int] = {pid: row for row, pid in enumerate(partner_ids)}
+        self.start = as_aware(start)
+        self.num_buckets = max(0, ceil((as_aware(end) - self.start) / self.bucket))
+        self.busy = np.zeros((len(self.partner_ids), self.num_buckets), dtype=bool)
+
+    @property
+    def end(self) -> datetime:
+        return self.start + self.num_buckets * self.bucket
+
+    def _bucket_bounds(self, starts: Sequence[datetime], ends: Sequence[datetime]):
+        """Vectorized [first, last) bucket indices covering each interval"""
+        bucket_seconds = self.bucket.total_seconds()
+        start_offsets = np.fromiter(
+            ((as_aware(s) - self.start).total_seconds() for s in starts),
+            dtype=np.float64,
+            count=len(starts)
+        )
+        end_offsets = np.fromiter(
+            ((as_aware(e) - self.start).total_seconds() for e in ends),
+            dtype=np.float64,
+            count=len(ends)
+        )
+        first = np.floor(start_offsets / bucket_seconds).astype(np.int64)
+        last = np.ceil(end_offsets / bucket_seconds).astype(np.int64)
+        return first, last
+
+    def _paint(self, rows: np.ndarray, first: np.ndarray, last: np.ndarray, width: int) -> np.ndarray:
+        """Rasterize intervals into a (partners x width) mask with one cumulative sum"""
+        first = np.clip(first, 0, width)
+        last = np.clip(last, 0, width)
+        keep = first < last
+        delta = np.zeros((len(self.partner_ids), width + 1), dtype=np.int32)
+        np.add.at(delta, (rows[keep], first[keep]), 1)
+        np.add.at(delta, (rows[keep], last[keep]), -1)
+        return np.cumsum(delta[:, :-1], axis=1) > 0
+
+    def add_bookings(
+        self,
+        partner_ids: Sequence[int],
+        starts: Sequence[datetime],
+        ends: Sequence[datetime],
+        cooldown: timedelta
+    ) -> None:
+        """Mark bookings busy and dilate them by the cooldown on both sides"""
+        if not len(partner_ids):
+            return
+        rows = np.fromiter((self.row_index[pid] for pid in partner_ids), dtype=np.int64)
+        first, last = self._bucket_bounds(starts, ends)
+
+        # Paint on a grid padded by the dilation radius so bookings just
+        # outside the matrix still push their cooldown into it
+        radius = ceil(cooldown / self.bucket)
+        width = self.num_buckets + 2 * radius
+        mask = self._paint(rows, first + radius, last + radius, width)
+
+        if radius:
+            # Sliding-window "any" over 2 * radius + 1 buckets via prefix sums
+            counts = np.zeros((mask.shape[0], width + 1), dtype=np.int32)
+            np.cumsum(mask, axis=1, out=counts[:, 1:])
+            mask = (counts[:, 2 * radius + 1:] - counts[:, :self.num_buckets]) > 0
+
+        self.busy |= mask
+
+    def add_blocked(
+        self,
+        partner_ids: Sequence[int],
+        starts: Sequence[datetime],
+        ends: Sequence[datetime]
+    ) -> None:
+        """Mark blocked availability windows busy"""
+        if not len(partner_ids):
+            return
+        rows = np.fromiter((self.row_index[pid] for pid in partner_ids), dtype=np.int64)
+        first, last = self._bucket_bounds(starts, ends)
+        self.busy |= self._paint(rows, first, last, self.num_buckets)
+
+    def free_mask(self, start: datetime, end: datetime) -> np.ndarray:
+        """Boolean array, True for every partner free during [start, end)"""
+        first, last = self._bucket_bounds([start], [end])
+        first, last = int(first[0]), int(last[0])
+        if first < 0 or last > self.num_buckets:
+            raise ValueError("Requested window is outside the availability matrix")
+        return ~self.busy[:, first:last].any(axis=1)
+
+    def free_partner_ids(self, start: datetime, end: datetime) -> List[int]:
+        """Ids of the partners free during [start, end)"""
+        return self.partner_ids[self.free_mask(start, end)].tolist()
+
+def query_busy_rows(
+    db: Session,
+    partner_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+    cooldown: timedelta,
+    include_holds: bool = True,
+    customer_id: Optional[int] = None
+) -> list:
+    """
+    Uncancelled bookings and slot holds (whose break reaches the range) and
+    blocked availabilities of many partners in one UNION ALL query, plus the
+    windows blocked by recurring rules. Rows carry partner_id, start, end and
+    is_booking; holds count as bookings, except customer_id's own.
+    """
+    bookings = select(
+        Booking.partner_id,
+        Booking.start_datetime.label("start"),
+        Booking.end_datetime.label("end"),
+        literal(True).label("is_booking")
+    ).where(
+        Booking.partner_id.in_(partner_ids),
+        Booking.status != BookingStatus.CANCELLED,
+        Booking.start_datetime < end + cooldown,
+        Booking.end_datetime > start - cooldown
+    )
+    blocked = select(
+        PartnerAvailability.partner_id,
+        PartnerAvailability.start_time.label("start"),
+        PartnerAvailability.end_time.label("end"),
+        literal(False).label("is_booking")
+    ).where(
+        PartnerAvailability.partner_id.in_(partner_ids),
+        PartnerAvailability.is_blocked == True,
+        PartnerAvailability.start_time < end,
+        PartnerAvailability.end_time > start
+    )
+    parts = [bookings, blocked]
+    if include_holds:
+        parts.append(select(
+            SlotHold.partner_id,
+            SlotHold.start_datetime.label("start"),
+            SlotHold.end_datetime.label("end"),
+            literal(True).label("is_booking")
+        ).where(*active_hold_filters(partner_ids, start, end, customer_id)))
+    rows = list(db.execute(union_all(*parts)).all())
+    for partner_id, intervals in get_rule_blocked_intervals(db, partner_ids, start, end).items():
+        rows.extend(BusyRow(partner_id, s, e, False) for s, e in intervals)
+    return rows
+
+def build_busy_timelines(
+    db: Session,
+    partner_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+    include_holds: bool = True,
+    customer_id: Optional[int] = None
+) -> Dict[int, BusyTimeline]:
+    """Busy timelines of many partners, bookings widened by the cooldown, from one query"""
+    cooldown = get_break_duration()
+    intervals = defaultdict(list)
+    for row in query_busy_rows(db, partner_ids, start, end, cooldown, include_holds, customer_id):
+        if row.is_booking:
+            intervals[row.partner_id].append((row.start - cooldown, row.end + cooldown))
+        else:
+            intervals[row.partner_id].append((row.start, row.end))
+    return {partner_id: BusyTimeline(intervals[partner_id]) for partner_id in partner_ids}
+
+def build_availability_matrix(
+    db: Session,
+    partner_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+    customer_id: Optional[int] = None
+) -> AvailabilityMatrix:
+    """
+    Build the availability matrix of many partners with a single range query
+    over bookings and blocked partner availabilities.
+    """
+    matrix = AvailabilityMatrix(partner_ids, start, end)
+    if not len(partner_ids) or not matrix.num_buckets:
+        return matrix
+
+    cooldown = get_break_duration()
+    rows = query_busy_rows(
+        db, partner_ids, matrix.start, matrix.end, cooldown, customer_id=customer_id
+    )
+
+    booking_rows = [row for row in rows if row.is_booking]
+    blocked_rows = [row for row in rows if not row.is_booking]
+    matrix.add_bookings(
+        [row.partner_id for row in booking_rows],
+        [row.start for row in booking_rows],
+        [row.end for row in booking_rows],
+        cooldown
+    )
+    matrix.add_blocked(
+        [row.partner_id for row in blocked_rows],
+        [row.start for row in blocked_rows],
+        [row.end for row in blocked_rows]
+    )
+    return matrix
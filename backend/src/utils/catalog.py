@@ -0,0 +1,229 @@
+# src/utils/catalog.py
+import logging
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+from src.models.partner import Partner
+from src.schemas.enums import PartnerRole
+from src.schemas.partner import PartnerFilter, PartnerResponse, SpecializationMatch
+
+logger = logging.getLogger(__name__)
+
+CatalogKey = Tuple[str, PartnerRole]
+# Partner count, sum of versions and highest id; changes on every insert,
+# update and delete of a partner
+CatalogSignature = Tuple[int, int, int]
+
+class SortedIndex:
+    """Partners of one bucket ordered by one attribute, for range lookups"""
+
+    def __init__(self, partners: Sequence[PartnerResponse], key: Callable[[PartnerResponse], float]):
+        self.partners = sorted(partners, key=key)
+        self.keys = [key(p) for p in self.partners]
+
+    def at_least(self, value: float) -> List[PartnerResponse]:
+        return self.partners[bisect_left(self.keys, value):]
+
+    def at_most(self, value: float) -> List[PartnerResponse]:
+        return self.partners[:bisect_right(self.keys, value)]
+
+class CatalogBucket:
+    """
+    Partners of one (kecamatan, role), with sorted indexes on the filtered
+    attributes and an inverted index from specialization to partner ids
+    """
+
+    def __init__(self, partners: Sequence[PartnerResponse]):
+        self.partners = sorted(partners, key=lambda p: p.id)
+        self.by_id = {p.id: p for p in self.partners}
+        self.by_rating = SortedIndex(self.partners, lambda p: p.rating)
+        self.by_experience = SortedIndex(self.partners, lambda p: p.experience_years)
+        self.by_hourly_rate = SortedIndex(self.partners, lambda p: p.pricing.hourly_rate)
+        # Inverted index: specialization -> ids of the partners having it
+        grouped: Dict[str, set] = {}
+        for partner in self.partners:
+            for specialization in partner.specializations:
+                grouped.setdefault(specialization, set()).add(partner.id)
+        self.by_specialization = {s: frozenset(ids) for s, ids in grouped.items()}
+
+    def search(self, filters: Optional[PartnerFilter]) -> List[PartnerResponse]:
+        """Partners matching the filters, by id. Starts from the narrowest index range."""
+        if not filters:
+            return list(self.partners)
+
+        ranges = [self.partners]
+        if filters.min_rating:
+            ranges.append(self.by_rating.at_least(filters.min_rating))
+        if filters.min_experience:
+            ranges.append(self.by_experience.at_least(filters.min_experience))
+        if filters.max_hourly_rate:
+            ranges.append(self.by_hourly_rate.at_most(filters.max_hourly_rate))
+        candidates = min(ranges, key=len)
+        by_id = candidates is self.partners
+
+        ids = self.specialization_ids(filters)
+        if ids is not None and len(ids) < len(candidates):
+            candidates, by_id = [self.by_id[i] for i in sorted(ids)], True
+
+        matches = [
+            p for p in candidates
+            if _in_ranges(p, filters) and (ids is None or p.id in ids)
+        ]
+        if not by_id:
+            matches.sort(key=lambda p: p.id)
+        return matches
+
+    def specialization_ids(self, filters: PartnerFilter) -> Optional[FrozenSet[int]]:
+        """Ids of the partners passing the specialization filters, None without any"""
+        required = [filters.specialization] if filters.specialization else []
+        ids = None
+        if filters.specializations:
+            if filters.specialization_match == SpecializationMatch.ALL:
+                required.extend(filters.specializations)
+            else:
+                ids = frozenset().union(*(
+                    self.by_specialization.get(s, frozenset()) for s in filters.specializations
+                ))
+        # Smallest posting first, every intersection is at most that large
+        for specialization in sorted(required, key=lambda s: len(self.by_specialization.get(s, ()))):
+            posting = self.by_specialization.get(specialization, frozenset())
+            ids = posting if ids is None else ids & posting
+        return ids
+
+def _in_ranges(partner: PartnerResponse, filters: PartnerFilter) -> bool:
+    if filters.min_rating and partner.rating < filters.min_rating:
+        return False
+    if filters.min_experience and partner.experience_years < filters.min_experience:
+        return False
+    if filters.max_hourly_rate and partner.pricing.hourly_rate > filters.max_hourly_rate:
+        return False
+    return True
+
+class PartnerCatalog:
+    """
+    Read-only snapshot of every partner, bucketed by (kecamatan, role).
+    A new snapshot replaces the old one when partners change; searches on
+    a snapshot never touch the database.
+    """
+
+    def __init__(self, partners: Sequence[PartnerResponse], signature: CatalogSignature):
+        grouped: Dict[CatalogKey, List[PartnerResponse]] = {}
+        for partner in partners:
+            grouped.setdefault((partner.kecamatan, partner.role), []).append(partner)
+        self.buckets = {key: CatalogBucket(group) for key, group in grouped.items()}
+        self.by_id = {partner.id: partner for partner in partners}
+        self.signature = signature
+
+    @classmethod
+    def load(cls, db: Session) -> "PartnerCatalog":
+        """Build a snapshot from one query over the partners table"""
+        partners = db.query(Partner).all()
+        signature = (
+            len(partners),
+            sum(p.version for p in partners),
+            max((p.id for p in partners), default=0)
+        )
+        catalog = cls([PartnerResponse.model_validate(p) for p in partners], signature)
+        logger.info(
+            "Loaded partner catalog: %d partners in %d buckets, %d KiB",
+            len(catalog.by_id), len(catalog.buckets), catalog.memory_bytes() // 1024
+        )
+        return catalog
+
+    def search(
+        self,
+        kecamatan: str,
+        filters: Optional[PartnerFilter] = None,
+        roles: Optional[Sequence[PartnerRole]] = None
+    ) -> List[PartnerResponse]:
+        """Partners of the kecamatan matching the filters, by id. `roles` overrides filters.role."""
+        if roles is None:
+            roles = [filters.role] if filters and filters.role else list(PartnerRole)
+        partners = []
+        for role in roles:
+            bucket = self.buckets.get((kecamatan, role))
+            if bucket:
+                partners.extend(bucket.search(filters))
+        if len(roles) > 1:
+            partners.sort(key=lambda p: p.id)
+        return partners
+
+    def get(self, partner_id: int) -> Optional[PartnerResponse]:
+        return self.by_id.get(partner_id)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the snapshot, partners and indexes included"""
+        return _deep_sizeof(self.buckets) + _deep_sizeof(self.by_id)
+
+def _deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+_catalog: Optional[PartnerCatalog] = None
+_stale = True
+_lock = threading.Lock()
+
+def get_partner_catalog(db: Session) -> PartnerCatalog:
+    """The current catalog, rebuilt first when partners changed in this process"""
+    global _catalog, _stale
+    if _catalog is None or _stale:
+        with _lock:
+            if _catalog is None or _stale:
+                # Cleared before loading, so a commit during the load marks it stale again
+                _stale = False
+                _catalog = PartnerCatalog.load(db)
+    return _catalog
+
+def refresh_partner_catalog(db: Session) -> bool:
+    """
+    Poll the partners' version signature and rebuild the catalog when
+    another process changed them. Returns whether it was rebuilt.
+    """
+    global _catalog, _stale
+    signature = tuple(db.execute(select(
+        func.count(Partner.id),
+        func.coalesce(func.sum(Partner.version), 0),
+        func.coalesce(func.max(Partner.id), 0)
+    )).one())
+    if _catalog is not None and not _stale and _catalog.signature == signature:
+        return False
+    with _lock:
+        _stale = False
+        _catalog = PartnerCatalog.load(db)
+    return True
+
+def invalidate_partner_catalog() -> None:
+    global _stale
+    _stale = True
+
+@event.listens_for(Partner, "after_insert")
+@event.listens_for(Partner, "after_update")
+@event.listens_for(Partner, "after_delete")
+def _partner_changed(mapper, connection, target) -> None:
+    # Only rebuild once the change is committed and visible to the reload
+    session = object_session(target)
+    if session is not None:
+        session.info["partner_catalog_stale"] = True
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session) -> None:
+    if session.info.pop("partner_catalog_stale", False):
+        invalidate_partner_catalog()
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session) -> None:
+    session.info.pop("partner_catalog_stale", None)
@@ -0,0 +1,229 @@
+# src/utils/conflicts.py
+from datetime import datetime
+from enum import Enum
+from typing import List, NamedTuple, Optional, Sequence, Set
+from sqlalchemy import select, exists, func, union
+from sqlalchemy.orm import Session
+from src.models.booking import Booking
+from src.models.partner import Partner
+from src.models.partner_availability import PartnerAvailability
+from src.models.slot_hold import SlotHold
+from .holds import active_hold_filters
+from src.schemas.booking import BookingStatus
+from .timeline import BusyTimeline, Interval, as_aware, get_break_duration
+from .availability import query_busy_rows
+from .recurrence import get_rule_blocked_intervals
+
+class ConflictReason(str, Enum):
+    PARTNER_UNAVAILABLE = "partner_unavailable"
+    OVERLAP = "overlap"
+    HELD = "held"
+    BLOCKED = "blocked"
+    PREVIOUS_GAP = "previous_gap"
+    NEXT_GAP = "next_gap"
+
+CONFLICT_MESSAGES = {
+    ConflictReason.PARTNER_UNAVAILABLE: "Partner not found or unavailable",
+    ConflictReason.OVERLAP: "Time slot already booked",
+    ConflictReason.HELD: "Time slot is being held by another customer",
+    ConflictReason.BLOCKED: "Partner is not available at this time",
+    ConflictReason.PREVIOUS_GAP: "Must allow 1-hour break between bookings",
+    ConflictReason.NEXT_GAP: "Must allow 1-hour break between bookings",
+}
+
+class ConflictCheck(NamedTuple):
+    partner_available: bool
+    has_overlap: bool
+    is_held: bool
+    is_blocked: bool
+    previous_end: Optional[datetime]
+    next_start: Optional[datetime]
+    previous_gap_ok: bool
+    next_gap_ok: bool
+
+    @property
+    def reason(self) -> Optional[ConflictReason]:
+        """The most important reason the slot cannot be booked, if any"""
+        if not self.partner_available:
+            return ConflictReason.PARTNER_UNAVAILABLE
+        if self.has_overlap:
+            return ConflictReason.OVERLAP
+        if self.is_held:
+            return ConflictReason.HELD
+        if self.is_blocked:
+            return ConflictReason.BLOCKED
+        if not self.previous_gap_ok:
+            return ConflictReason.PREVIOUS_GAP
+        if not self.next_gap_ok:
+            return ConflictReason.NEXT_GAP
+        return None
+
+    @property
+    def is_available(self) -> bool:
+        return self.reason is None
+
+    @property
+    def has_required_break(self) -> bool:
+        return self.previous_gap_ok and self.next_gap_ok
+
+    @property
+    def message(self) -> str:
+        return CONFLICT_MESSAGES.get(self.reason, "")
+
+def check_partner_conflicts(
+    db: Session,
+    partner_id: int,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    exclude_booking_id: Optional[int] = None,
+    customer_id: Optional[int] = None
+) -> ConflictCheck:
+    """
+    Check a partner's schedule for a new booking in one round trip: partner
+    status, overlapping bookings, slot holds, blocked slots and the bookings
+    right before and after the slot (for the break) come back as a single
+    row. Holds of customer_id itself do not count. Recurring rules are
+    checked from the in-process rule cache.
+    """
+    active = [
+        Booking.partner_id == partner_id,
+        Booking.status != BookingStatus.CANCELLED
+    ]
+    if exclude_booking_id:
+        active.append(Booking.id != exclude_booking_id)
+
+    overlap = exists().where(
+        *active,
+        Booking.start_datetime < end_datetime,
+        Booking.end_datetime > start_datetime
+    )
+    previous_end = select(func.max(Booking.end_datetime)).where(
+        *active,
+        Booking.end_datetime <= start_datetime
+    ).scalar_subquery()
+    next_start = select(func.min(Booking.start_datetime)).where(
+        *active,
+        Booking.start_datetime >= end_datetime
+    ).scalar_subquery()
+    cooldown = get_break_duration()
+    held = exists().where(
+        *active_hold_filters([partner_id], start_datetime, end_datetime, customer_id)
+    )
+    blocked = exists().where(
+        PartnerAvailability.partner_id == partner_id,
+        PartnerAvailability.is_blocked == True,
+        PartnerAvailability.start_time < end_datetime,
+        PartnerAvailability.end_time > start_datetime
+    )
+
+    row = db.execute(
+        select(
+            Partner.is_available,
+            overlap.label("has_overlap"),
+            held.label("is_held"),
+            previous_end.label("previous_end"),
+            next_start.label("next_start"),
+            blocked.label("is_blocked")
+        ).where(Partner.id == partner_id)
+    ).first()
+
+    if row is None:
+        return ConflictCheck(False, False, False, False, None, None, True, True)
+
+    is_blocked = bool(row.is_blocked) or bool(
+        get_rule_blocked_intervals(db, [partner_id], start_datetime, end_datetime).get(partner_id)
+    )
+
+    start_datetime, end_datetime = as_aware(start_datetime), as_aware(end_datetime)
+    previous_gap_ok = (
+        row.previous_end is None or
+        start_datetime - as_aware(row.previous_end) >= cooldown
+    )
+    next_gap_ok = (
+        row.next_start is None or
+        as_aware(row.next_start) - end_datetime >= cooldown
+    )
+
+    return ConflictCheck(
+        partner_available=bool(row.is_available),
+        has_overlap=bool(row.has_overlap),
+        is_held=bool(row.is_held),
+        is_blocked=is_blocked,
+        previous_end=row.previous_end,
+        next_start=row.next_start,
+        previous_gap_ok=previous_gap_ok,
+        next_gap_ok=next_gap_ok
+    )
+
+def find_busy_partner_ids(
+    db: Session,
+    partner_ids: Sequence[int],
+    start_datetime: datetime,
+    end_datetime: datetime,
+    customer_id: Optional[int] = None
+) -> Set[int]:
+    """
+    Ids of the partners that check_partner_conflicts would reject for
+    [start, end), from one query: bookings within the break of the slot,
+    slot holds (other than customer_id's) and blocked slots. Recurring rules
+    come from the rule cache. Partner status is left to the caller.
+    """
+    if not partner_ids:
+        return set()
+    cooldown = get_break_duration()
+    bookings = select(Booking.partner_id).where(
+        Booking.partner_id.in_(partner_ids),
+        Booking.status != BookingStatus.CANCELLED,
+        Booking.start_datetime < end_datetime + cooldown,
+        Booking.end_datetime > start_datetime - cooldown
+    )
+    held = select(SlotHold.partner_id).where(
+        *active_hold_filters(partner_ids, start_datetime, end_datetime, customer_id)
+    )
+    blocked = select(PartnerAvailability.partner_id).where(
+        PartnerAvailability.partner_id.in_(partner_ids),
+        PartnerAvailability.is_blocked == True,
+        PartnerAvailability.start_time < end_datetime,
+        PartnerAvailability.end_time > start_datetime
+    )
+    busy = set(db.execute(union(bookings, held, blocked)).scalars().all())
+    rules = get_rule_blocked_intervals(db, partner_ids, start_datetime, end_datetime)
+    busy.update(partner_id for partner_id, intervals in rules.items() if intervals)
+    return busy
+
+def check_series_conflicts(
+    db: Session,
+    partner_id: int,
+    occurrences: Sequence[Interval]
+) -> List[Optional[ConflictReason]]:
+    """
+    Check every occurrence of a booking series against the partner's schedule
+    with one busy query over the whole span. Returns the conflict reason of
+    each occurrence, None when it can be booked. Partner status is left to
+    the caller.
+    """
+    if not occurrences:
+        return []
+    cooldown = get_break_duration()
+    span_start = min(as_aware(start) for start, _ in occurrences)
+    span_end = max(as_aware(end) for _, end in occurrences)
+
+    bookings, blocked = [], []
+    for row in query_busy_rows(db, [partner_id], span_start, span_end, cooldown):
+        (bookings if row.is_booking else blocked).append((row.start, row.end))
+    booked = BusyTimeline(bookings)
+    blocked = BusyTimeline(blocked)
+
+    reasons = []
+    for start, end in occurrences:
+        if not booked.is_free(start, end):
+            reasons.append(ConflictReason.OVERLAP)
+        elif not blocked.is_free(start, end):
+            reasons.append(ConflictReason.BLOCKED)
+        elif not booked.is_free(start - cooldown, start):
+            reasons.append(ConflictReason.PREVIOUS_GAP)
+        elif not booked.is_free(end, end + cooldown):
+            reasons.append(ConflictReason.NEXT_GAP)
+        else:
+            reasons.append(None)
+    return reasons
@@ -0,0 +1,176 @@
+# src/utils/free_intervals.py
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+from sqlalchemy import select, delete, insert, exists, event
+from sqlalchemy.orm import Session, object_session
+from src.models.partner import Partner
+from src.models.partner_availability import PartnerAvailability
+from src.models.partner_availability_rule import PartnerAvailabilityRule
+from src.models.partner_free_interval import PartnerFreeInterval
+from src.models.slot_hold import SlotHold
+from src.config.settings import settings
+from .availability import build_busy_timelines
+from .holds import active_hold_filters
+from .timeline import as_aware, get_break_duration
+
+def get_horizon_end() -> datetime:
+    """How far ahead partner_free_intervals is kept up to date"""
+    return datetime.now(timezone.utc) + timedelta(days=settings.FREE_INTERVAL_HORIZON_DAYS)
+
+def covers(start: datetime, end: datetime) -> bool:
+    """
+    Whether partner_free_intervals can answer [start, end): it is rebuilt
+    every FREE_INTERVAL_REBUILD_SECONDS, so it reliably reaches the horizon
+    minus one rebuild period, and starts no earlier than now.
+    """
+    now = datetime.now(timezone.utc)
+    covered_until = get_horizon_end() - timedelta(seconds=settings.FREE_INTERVAL_REBUILD_SECONDS)
+    return now <= as_aware(start) and as_aware(end) <= covered_until
+
+def _lock_partners(db: Session, partner_ids: Sequence[int]) -> None:
+    # Serializes refreshes and rebuilds of the same partner, so none of them
+    # writes intervals derived from bookings another one has not yet seen.
+    # NO KEY UPDATE leaves booking inserts referencing the partner unblocked.
+    db.execute(
+        select(Partner.id).where(Partner.id.in_(partner_ids))
+        .order_by(Partner.id).with_for_update(key_share=True)
+    ).all()
+
+def refresh_free_intervals(
+    db: Session,
+    partner_id: int,
+    start: datetime,
+    end: datetime
+) -> None:
+    """
+    Recompute a partner's free intervals around a booking that was added,
+    cancelled or moved. Runs inside the caller's transaction; the caller
+    commits.
+    """
+    # The changed booking has to be visible to the busy query below
+    db.flush()
+    _lock_partners(db, [partner_id])
+
+    cooldown = get_break_duration()
+    window_start = as_aware(start) - cooldown
+    window_end = min(as_aware(end) + cooldown, get_horizon_end())
+    if window_start >= window_end:
+        return
+
+    # Free intervals touching the window get split or merged, so they are
+    # removed and the window grows to cover them
+    removed = db.execute(
+        delete(PartnerFreeInterval).where(
+            PartnerFreeInterval.partner_id == partner_id,
+            PartnerFreeInterval.start_time <= window_end,
+            PartnerFreeInterval.end_time >= window_start
+        ).returning(PartnerFreeInterval.start_time, PartnerFreeInterval.end_time)
+    ).all()
+    for row in removed:
+        window_start = min(window_start, as_aware(row.start_time))
+        window_end = max(window_end, as_aware(row.end_time))
+
+    timeline = build_busy_timelines(
+        db, [partner_id], window_start, window_end, include_holds=False
+    )[partner_id]
+    rows = [
+        {"partner_id": partner_id, "start_time": gap_start, "end_time": gap_end}
+        for gap_start, gap_end in timeline.gaps(window_start, window_end)
+    ]
+    if rows:
+        db.execute(insert(PartnerFreeInterval), rows)
+
+def rebuild_free_intervals(
+    db: Session,
+    partner_ids: Optional[Sequence[int]] = None
+) -> int:
+    """
+    Reconcile partner_free_intervals from scratch for the given partners (all
+    by default), from now until the horizon. The caller commits.
+    """
+    if partner_ids is None:
+        partner_ids = db.execute(select(Partner.id)).scalars().all()
+    if not partner_ids:
+        return 0
+
+    _lock_partners(db, partner_ids)
+    db.execute(
+        delete(PartnerFreeInterval).where(PartnerFreeInterval.partner_id.in_(partner_ids))
+    )
+
+    start = datetime.now(timezone.utc)
+    end = get_horizon_end()
+    rows = [
+        {"partner_id": partner_id, "start_time": gap_start, "end_time": gap_end}
+        for partner_id, timeline in build_busy_timelines(
+            db, partner_ids, start, end, include_holds=False
+        ).items()
+        for gap_start, gap_end in timeline.gaps(start, end)
+    ]
+    if rows:
+        db.execute(insert(PartnerFreeInterval), rows)
+    return len(rows)
+
+def rebuild_all_free_intervals(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Rebuild the free intervals of every partner, one committed batch of
+    partners at a time, so the table keeps reaching the horizon as days
+    pass. Returns the number of intervals written.
+    """
+    batch_size = batch_size or settings.FREE_INTERVAL_REBUILD_BATCH
+    partner_ids = db.execute(select(Partner.id).order_by(Partner.id)).scalars().all()
+    count = 0
+    for i in range(0, len(partner_ids), batch_size):
+        count += rebuild_free_intervals(db, partner_ids[i:i + batch_size])
+        db.commit()
+    return count
+
+def find_free_partner_ids(
+    db: Session,
+    partner_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+    customer_id: Optional[int] = None
+) -> List[int]:
+    """
+    Partners with one free interval covering [start, end), in one indexed
+    lookup. Slot holds are too short-lived for the table and are checked
+    on the fly, except customer_id's own.
+    """
+    return db.execute(
+        select(PartnerFreeInterval.partner_id).where(
+            PartnerFreeInterval.partner_id.in_(partner_ids),
+            PartnerFreeInterval.start_time <= start,
+            PartnerFreeInterval.end_time >= end,
+            ~exists().where(
+                SlotHold.partner_id == PartnerFreeInterval.partner_id,
+                *active_hold_filters(partner_ids, start, end, customer_id)
+            )
+        ).distinct()
+    ).scalars().all()
+
+@event.listens_for(Partner, "after_insert")
+@event.listens_for(PartnerAvailability, "after_insert")
+@event.listens_for(PartnerAvailability, "after_update")
+@event.listens_for(PartnerAvailability, "after_delete")
+@event.listens_for(PartnerAvailabilityRule, "after_insert")
+@event.listens_for(PartnerAvailabilityRule, "after_update")
+@event.listens_for(PartnerAvailabilityRule, "after_delete")
+def _schedule_changed(mapper, connection, target) -> None:
+    # New partners and changed blocked slots or rules are rebuilt on commit
+    session = object_session(target)
+    if session is not None:
+        partner_id = target.id if isinstance(target, Partner) else target.partner_id
+        session.info.setdefault("free_interval_partners", set()).add(partner_id)
+
+@event.listens_for(Session, "before_commit")
+def _rebuild_changed_partners(session) -> None:
+    # Flushed first, so changes made right before the commit are marked too
+    session.flush()
+    partner_ids = session.info.pop("free_interval_partners", None)
+    if partner_ids:
+        rebuild_free_intervals(session, sorted(partner_ids))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_partners(session) -> None:
+    session.info.pop("free_interval_partners", None)
@@ -0,0 +1,59 @@
+# src/utils/holds.py
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from src.models.slot_hold import SlotHold
+from .timeline import get_break_duration
+
+def active_hold_filters(
+    partner_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+    customer_id: Optional[int] = None
+) -> list:
+    """
+    Filters matching the unexpired holds whose break reaches [start, end).
+    With customer_id, that customer's own holds are left out: they never
+    block the customer who placed them.
+    """
+    cooldown = get_break_duration()
+    filters = [
+        SlotHold.partner_id.in_(partner_ids),
+        SlotHold.expires_at > datetime.now(timezone.utc),
+        SlotHold.start_datetime < end + cooldown,
+        SlotHold.end_datetime > start - cooldown
+    ]
+    if customer_id:
+        filters.append(SlotHold.customer_id != customer_id)
+    return filters
+
+def get_active_holds(
+    db: Session,
+    partner_ids: Sequence[int],
+    start: datetime,
+    end: datetime
+) -> List[SlotHold]:
+    return db.query(SlotHold).filter(*active_hold_filters(partner_ids, start, end)).all()
+
+def consume_hold(
+    db: Session,
+    customer_id: int,
+    partner_id: int,
+    start: datetime,
+    end: datetime
+) -> None:
+    """Drop the customer's hold on the slot being booked. The caller commits."""
+    db.execute(delete(SlotHold).where(
+        SlotHold.customer_id == customer_id,
+        SlotHold.partner_id == partner_id,
+        SlotHold.start_datetime < end,
+        SlotHold.end_datetime > start
+    ))
+
+def sweep_expired_holds(db: Session, partner_id: Optional[int] = None) -> int:
+    """Delete expired holds, of one partner or all of them. The caller commits."""
+    query = delete(SlotHold).where(SlotHold.expires_at <= datetime.now(timezone.utc))
+    if partner_id is not None:
+        query = query.where(SlotHold.partner_id == partner_id)
+    return db.execute(query).rowcount
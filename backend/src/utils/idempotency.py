@@ -0,0 +1,145 @@
+# src/utils/idempotency.py
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.models.idempotency_key import IdempotencyKey
+from src.config.settings import settings
+
+CacheKey = Tuple[int, str]
+
+# (customer_id, key) -> (expires_at, request_hash, response), least recently used first
+_results: "OrderedDict[CacheKey, Tuple[datetime, str, dict]]" = OrderedDict()
+# Requests this process is still running, for duplicates to wait on
+_in_flight: Dict[CacheKey, asyncio.Event] = {}
+
+def hash_request(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+def _check_same_request(stored_hash: str, request_hash: str) -> None:
+    if stored_hash != request_hash:
+        raise ValueError("Idempotency-Key was already used with a different request")
+
+def _remember(cache_key: CacheKey, expires_at: datetime, request_hash: str, response: dict) -> None:
+    _results[cache_key] = (expires_at, request_hash, response)
+    _results.move_to_end(cache_key)
+    while len(_results) > settings.IDEMPOTENCY_CACHE_SIZE:
+        _results.popitem(last=False)
+
+def _cached(cache_key: CacheKey, request_hash: str) -> Optional[dict]:
+    entry = _results.get(cache_key)
+    if entry is None:
+        return None
+    expires_at, stored_hash, response = entry
+    if expires_at <= datetime.now(timezone.utc):
+        del _results[cache_key]
+        return None
+    _check_same_request(stored_hash, request_hash)
+    _results.move_to_end(cache_key)
+    return response
+
+def _claim(
+    db: Session,
+    customer_id: int,
+    key: str,
+    request_hash: str
+) -> Optional[IdempotencyKey]:
+    """
+    Insert the key as in flight. Returns None once claimed, or the row of the
+    request that holds it.
+    """
+    now = datetime.now(timezone.utc)
+    lookup = (IdempotencyKey.customer_id == customer_id, IdempotencyKey.key == key)
+    # Finished keys past their TTL and claims abandoned by a crashed request
+    db.execute(delete(IdempotencyKey).where(*lookup, IdempotencyKey.expires_at <= now))
+    try:
+        db.execute(insert(IdempotencyKey).values(
+            customer_id=customer_id,
+            key=key,
+            request_hash=request_hash,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+        ))
+        db.commit()
+        return None
+    except IntegrityError:
+        db.rollback()
+    return db.execute(select(IdempotencyKey).where(*lookup)).scalar_one_or_none()
+
+async def run_idempotent(
+    db: Session,
+    customer_id: int,
+    key: str,
+    payload: BaseModel,
+    operation: Callable[[], Awaitable[BaseModel]]
+) -> dict:
+    """
+    Run operation once per (customer, Idempotency-Key) and return its
+    response as JSON data. Repeats are answered from the in-process LRU or
+    the idempotency_keys table; a duplicate arriving while the first request
+    runs waits for its result. Failed requests release the key so the
+    client can retry.
+    """
+    cache_key = (customer_id, key)
+    request_hash = hash_request(payload)
+    cached = _cached(cache_key, request_hash)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.IDEMPOTENCY_WAIT_SECONDS
+    running = _in_flight.get(cache_key)
+    if running is not None:
+        try:
+            await asyncio.wait_for(running.wait(), settings.IDEMPOTENCY_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            raise ValueError("A request with this Idempotency-Key is still being processed")
+        cached = _cached(cache_key, request_hash)
+        if cached is not None:
+            return cached
+
+    # Claim the key, or wait for the request of another worker holding it
+    while True:
+        row = _claim(db, customer_id, key, request_hash)
+        if row is None:
+            break
+        _check_same_request(row.request_hash, request_hash)
+        if row.response is not None:
+            _remember(cache_key, row.expires_at, request_hash, row.response)
+            return row.response
+        if loop.time() >= deadline:
+            raise ValueError("A request with this Idempotency-Key is still being processed")
+        await asyncio.sleep(0.2)
+
+    lookup = (IdempotencyKey.customer_id == customer_id, IdempotencyKey.key == key)
+    done = _in_flight[cache_key] = asyncio.Event()
+    try:
+        try:
+            response = (await operation()).model_dump(mode="json")
+        except BaseException:
+            db.rollback()
+            db.execute(delete(IdempotencyKey).where(*lookup))
+            db.commit()
+            raise
+
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        db.execute(update(IdempotencyKey).where(*lookup).values(
+            response=response,
+            expires_at=expires_at
+        ))
+        db.commit()
+        _remember(cache_key, expires_at, request_hash, response)
+        return response
+    finally:
+        del _in_flight[cache_key]
+        done.set()
+
+def purge_expired_keys(db: Session) -> int:
+    """Delete expired idempotency keys. The caller commits."""
+    return db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+    ).rowcount
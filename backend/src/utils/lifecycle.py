@@ -0,0 +1,78 @@
+# src/utils/lifecycle.py
+import logging
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, joinedload
+from src.models.booking import Booking
+from src.schemas.booking import BookingStatus
+from src.schemas.notification import NotificationType
+from src.config.settings import settings
+from .notification import enqueue_booking_notifications
+
+logger = logging.getLogger(__name__)
+
+class LifecycleStats(NamedTuple):
+    completed: int
+    batches: int
+    seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return self.completed / self.seconds if self.seconds else 0.0
+
+def complete_finished_bookings(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Mark one batch of bookings that have ended as completed with a single
+    UPDATE ... RETURNING and queue their completion notifications in bulk.
+    Rows locked by another worker or request are skipped. The caller commits.
+    """
+    due = select(Booking.id).where(
+        Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+        Booking.end_datetime < datetime.now(timezone.utc)
+    ).order_by(
+        Booking.end_datetime
+    ).limit(
+        batch_size or settings.BOOKING_LIFECYCLE_BATCH
+    ).with_for_update(skip_locked=True)
+
+    completed_ids = db.execute(
+        update(Booking).where(
+            Booking.id.in_(due)
+        ).values(
+            status=BookingStatus.COMPLETED
+        ).returning(Booking.id).execution_options(synchronize_session=False)
+    ).scalars().all()
+    if not completed_ids:
+        return 0
+
+    bookings = db.query(Booking).options(joinedload(Booking.partner)).filter(
+        Booking.id.in_(completed_ids)
+    ).all()
+    enqueue_booking_notifications(db, bookings, [NotificationType.BOOKING_COMPLETED])
+    return len(completed_ids)
+
+def run_booking_lifecycle(db: Session, batch_size: Optional[int] = None) -> LifecycleStats:
+    """Complete every booking that has ended, committing after each batch"""
+    batch_size = batch_size or settings.BOOKING_LIFECYCLE_BATCH
+    started = time.monotonic()
+    completed = batches = 0
+
+    while True:
+        count = complete_finished_bookings(db, batch_size)
+        db.commit()
+        if not count:
+            break
+        completed += count
+        batches += 1
+        if count < batch_size:
+            break
+
+    stats = LifecycleStats(completed, batches, time.monotonic() - started)
+    if stats.completed:
+        logger.info(
+            "Completed %d bookings in %d batches (%.2fs, %.0f bookings/s)",
+            stats.completed, stats.batches, stats.seconds, stats.per_second
+        )
+    return stats
@@ -0,0 +1,16 @@
+# src/utils/loaders.py
+"""
+Eager-loading presets, one per response schema. Services apply the preset
+of the response they build so nested objects are loaded up front instead of
+lazily, one row at a time.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+from src.models.booking import Booking
+from src.models.notification import Notification
+
+# BookingResponse nests PartnerResponse: many-to-one, joined into the same query
+BOOKING_RESPONSE = (joinedload(Booking.partner),)
+
+# NotificationResponse nests BookingResponse: one extra query for the bookings,
+# with their partners joined in
+NOTIFICATION_RESPONSE = (selectinload(Notification.booking).joinedload(Booking.partner),)
@@ -1,36 +1,60 @@
 # src/utils/matching.py
-from typing import List, Optional
+import heapq
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, TypeVar, Union
+import numpy as np
 from sqlalchemy.orm import Session
 from src.models.partner import Partner
-from src.schemas.partner import PartnerFilter
-from datetime import datetime
-from src.schemas.matching import MatchRequest
+from src.schemas.partner import PartnerFilter, PartnerResponse
+from datetime import datetime, timedelta
+from src.models.booking import Booking
+from src.schemas.matching import MatchRequest, MatchSortCriteria
 from src.schemas.booking import BookingStatus
-from sqlalchemy import cast, Float, String
-from sqlalchemy.sql import expression
+from sqlalchemy import select, union_all, literal, case, func, and_
 from src.config.settings import settings
+from .availability import build_availability_matrix
+from .catalog import get_partner_catalog
+from .free_intervals import covers, find_free_partner_ids
+from .recurrence import LOCAL_TIMEZONE
+from .timeline import as_aware
+
+MAX_EXPERIENCE_YEARS = 20  # Assume 20 years is maximum
+NEARBY_BOOKING_SECONDS = 7200
+
+# Larger is better; cheaper partners come first when sorting by price
+SORT_KEYS: Dict[MatchSortCriteria, Callable[[PartnerResponse], float]] = {
+    MatchSortCriteria.RATING: lambda p: p.rating,
+    MatchSortCriteria.EXPERIENCE: lambda p: p.experience_years,
+    MatchSortCriteria.PRICE: lambda p: -p.pricing.hourly_rate,
+}
+
+T = TypeVar("T")
 
 def match_partners(
     db: Session,
     kecamatan: str,
     filters: Optional[PartnerFilter],
-    current_time: datetime
-) -> List[Partner]:
-    query = db.query(Partner).filter(Partner.kecamatan == kecamatan)
-    
-    if filters:
-        if filters.role:
-            query = query.filter(Partner.role == filters.role)
-        if filters.min_rating:
-            query = query.filter(Partner.rating >= filters.min_rating)
-        if filters.min_experience:
-            query = query.filter(Partner.experience_years >= filters.min_experience)
-        if filters.max_hourly_rate:
-            query = query.filter(Partner.pricing['hourly_rate'].astext.cast(Float) <= filters.max_hourly_rate)
-        if filters.specialization:
-            query = query.filter(Partner.specializations.any(filters.specialization))
-    
-    return query.all()
+    current_time: datetime,
+    available_between: Optional[Tuple[datetime, datetime]] = None,
+    customer_id: Optional[int] = None
+) -> List[PartnerResponse]:
+    # Filters are answered from the in-process partner catalog
+    partners = get_partner_catalog(db).search(kecamatan, filters)
+
+    # Keep only partners free for the whole requested window, from the
+    # free interval table when it covers the window. The requester's own
+    # holds do not count.
+    if available_between and partners:
+        start, end = available_between
+        partner_ids = [p.id for p in partners]
+        if covers(start, end):
+            free_ids = set(find_free_partner_ids(db, partner_ids, start, end, customer_id))
+        else:
+            matrix = build_availability_matrix(db, partner_ids, start, end, customer_id)
+            free_ids = set(matrix.free_partner_ids(start, end))
+        partners = [p for p in partners if p.id in free_ids]
+
+    return partners
 
 def calculate_matching_score(
     partner: Partner,
@@ -44,7 +68,7 @@ def calculate_matching_score(
     score += (partner.rating / 5.0) * weights["rating"]
     
     # Experience score
-    max_experience = 20  # Assume 20 years is maximum
+    max_experience = MAX_EXPERIENCE_YEARS
     score += (min(partner.experience_years, max_experience) / max_experience) * weights["experience"]
     
     # Availability score
@@ -57,28 +81,89 @@ def calculate_matching_score(
     
     return score
 
+def booking_flags(partner: Partner, start_datetime: datetime) -> Tuple[bool, bool]:
+    """
+    Whether the partner has an active booking on the same (local) day, and
+    one starting within 2 hours. Walks partner.bookings; use
+    load_booking_flags to get the flags of many partners from the database.
+    """
+    start_datetime = as_aware(start_datetime)
+    day = start_datetime.astimezone(LOCAL_TIMEZONE).date()
+    same_day = nearby = False
+    for booking in partner.bookings:
+        if booking.status == BookingStatus.CANCELLED:
+            continue
+        booking_start = as_aware(booking.start_datetime)
+        same_day = same_day or booking_start.astimezone(LOCAL_TIMEZONE).date() == day
+        nearby = nearby or abs((booking_start - start_datetime).total_seconds()) <= NEARBY_BOOKING_SECONDS
+    return same_day, nearby
+
+def _booking_flags_query(key: int, partner_ids: Sequence[int], start_datetime: datetime):
+    """Same-day and nearby flags of partners around one start time, one row per partner"""
+    start_datetime = as_aware(start_datetime)
+    day_start = start_datetime.astimezone(LOCAL_TIMEZONE).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    day_end = day_start + timedelta(days=1)
+    nearby = timedelta(seconds=NEARBY_BOOKING_SECONDS)
+    near_start, near_end = start_datetime - nearby, start_datetime + nearby
+
+    return select(
+        literal(key).label("key"),
+        Booking.partner_id,
+        func.max(case((and_(
+            Booking.start_datetime >= day_start,
+            Booking.start_datetime < day_end
+        ), 1), else_=0)).label("same_day"),
+        func.max(case((and_(
+            Booking.start_datetime >= near_start,
+            Booking.start_datetime <= near_end
+        ), 1), else_=0)).label("nearby")
+    ).where(
+        Booking.partner_id.in_(partner_ids),
+        Booking.status != BookingStatus.CANCELLED,
+        # Only the day and the +-2 hour window are read, never the history
+        Booking.start_datetime >= min(day_start, near_start),
+        Booking.start_datetime <= max(day_end, near_end)
+    ).group_by(Booking.partner_id)
+
+def load_booking_flags(
+    db: Session,
+    partner_ids: Sequence[int],
+    start_datetimes: Sequence[datetime]
+) -> List[Tuple[bool, bool]]:
+    """
+    booking_flags of every (partner, start time) pair with one aggregate
+    query, one grouped select per distinct start time
+    """
+    by_start: Dict[datetime, List[int]] = defaultdict(list)
+    for partner_id, start in zip(partner_ids, start_datetimes):
+        by_start[start].append(partner_id)
+    starts = list(by_start)
+    if not starts:
+        return []
+
+    selects = [
+        _booking_flags_query(key, by_start[start], start)
+        for key, start in enumerate(starts)
+    ]
+    flags = {
+        (starts[row.key], row.partner_id): (bool(row.same_day), bool(row.nearby))
+        for row in db.execute(selects[0] if len(selects) == 1 else union_all(*selects))
+    }
+    return [
+        flags.get((start, partner_id), (False, False))
+        for partner_id, start in zip(partner_ids, start_datetimes)
+    ]
+
 def calculate_availability_score(partner: Partner, start_datetime: datetime) -> float:
     """Calculate availability score based on partner's schedule"""
-    # Ensure both datetimes are timezone-aware
-    start_datetime = start_datetime.astimezone()
-    
-    has_conflicts = any(
-        booking for booking in partner.bookings
-        if booking.status != BookingStatus.CANCELLED and
-        booking.start_datetime.astimezone().date() == start_datetime.date()
-    )
-    
+    has_conflicts, has_nearby = booking_flags(partner, start_datetime)
     if has_conflicts:
         return 0.0
     
     # Check if partner has nearby bookings (within 2 hours)
-    nearby_bookings = [
-        booking for booking in partner.bookings
-        if booking.status != BookingStatus.CANCELLED and
-        abs((booking.start_datetime.astimezone() - start_datetime).total_seconds()) <= 7200
-    ]
-    
-    if nearby_bookings:
+    if has_nearby:
         return 0.5
         
     return 1.0
@@ -93,3 +178,89 @@ def calculate_reviews_weight(total_reviews: int) -> float:
         return 0.9
     else:
         return 1.0
+
+class ScoreColumns(NamedTuple):
+    """Candidate partners as column arrays, one entry per partner"""
+    rating: np.ndarray
+    experience_years: np.ndarray
+    total_reviews: np.ndarray
+    has_same_day_booking: np.ndarray
+    has_nearby_booking: np.ndarray
+
+    @classmethod
+    def from_partners(
+        cls,
+        partners: Sequence[Partner],
+        start_datetime: Union[datetime, Sequence[datetime]]
+    ) -> "ScoreColumns":
+        """Columns of partners with their bookings loaded, for one start time or one per partner"""
+        if isinstance(start_datetime, datetime):
+            start_datetime = [start_datetime] * len(partners)
+        return cls._build(partners, [
+            booking_flags(p, start) for p, start in zip(partners, start_datetime)
+        ])
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        partners: Sequence[Partner],
+        start_datetime: Union[datetime, Sequence[datetime]]
+    ) -> "ScoreColumns":
+        """Columns of partners with the booking flags read by one aggregate query"""
+        if isinstance(start_datetime, datetime):
+            start_datetime = [start_datetime] * len(partners)
+        return cls._build(partners, load_booking_flags(db, [p.id for p in partners], start_datetime))
+
+    @classmethod
+    def _build(cls, partners: Sequence[Partner], flags: Sequence[Tuple[bool, bool]]) -> "ScoreColumns":
+        flags = np.array(flags, dtype=bool).reshape(len(partners), 2)
+        return cls(
+            rating=np.fromiter((p.rating for p in partners), dtype=np.float64, count=len(partners)),
+            experience_years=np.fromiter((p.experience_years for p in partners), dtype=np.float64, count=len(partners)),
+            total_reviews=np.fromiter((p.total_reviews for p in partners), dtype=np.int64, count=len(partners)),
+            has_same_day_booking=flags[:, 0],
+            has_nearby_booking=flags[:, 1]
+        )
+
+def batch_matching_scores(columns: ScoreColumns) -> np.ndarray:
+    """Vectorized calculate_matching_score over every candidate at once"""
+    weights = settings.MATCHING_SCORE_WEIGHTS
+    availability = np.where(
+        columns.has_same_day_booking,
+        0.0,
+        np.where(columns.has_nearby_booking, 0.5, 1.0)
+    )
+    reviews = np.select(
+        [columns.total_reviews == 0, columns.total_reviews < 10, columns.total_reviews < 50],
+        [0.5, 0.7, 0.9],
+        default=1.0
+    )
+
+    # Same order of operations as the scalar path, so scores match exactly
+    scores = (columns.rating / 5.0) * weights["rating"]
+    scores = scores + (
+        np.minimum(columns.experience_years, MAX_EXPERIENCE_YEARS) / MAX_EXPERIENCE_YEARS
+    ) * weights["experience"]
+    scores = scores + availability * weights["availability"]
+    scores = scores + reviews * weights["reviews"]
+    return scores
+
+def top_k(
+    items: Iterable[T],
+    key: Callable[[T], float],
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[T]:
+    """
+    Items with the largest keys, best first, skipping `offset` of them.
+    Ties keep their input order, like a stable sort. With a limit only
+    offset + limit items are kept in a heap instead of sorting them all.
+    """
+    if limit is None:
+        return sorted(items, key=key, reverse=True)[offset:]
+    return heapq.nlargest(offset + limit, items, key=key)[offset:]
+
+def rank_by_score(scores: np.ndarray) -> np.ndarray:
+    """Candidate indices by descending score, ties kept in input order"""
+    return np.argsort(-scores, kind="stable")
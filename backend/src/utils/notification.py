@@ -1,25 +1,28 @@
 # src/utils/notification.py
-from datetime import datetime, timedelta
-from fastapi_utils.tasks import repeat_every
+from datetime import datetime, timedelta, timezone
 from src.config.settings import settings
+from typing import Iterable, Optional, Sequence
+from sqlalchemy import insert, select, delete, literal
 from sqlalchemy.orm import Session
 from src.models.booking import Booking
-from src.schemas.notification import NotificationType, NotificationCreate
+from src.schemas.notification import NotificationType
 from src.models.notification import Notification
+from src.models.notification_outbox import NotificationOutbox
+from .recurrence import LOCAL_TIMEZONE
+from .timeline import as_aware
 
-@repeat_every(seconds=60)
-def check_upcoming_bookings():
-    # Implementation for checking and sending notifications
-    reminder_time = datetime.utcnow() + timedelta(minutes=settings.NOTIFICATION_REMINDER)
-    # Query and notify users about upcoming bookings
-    pass
+BOOKING_NOTIFICATIONS = (
+    NotificationType.BOOKING_REMINDER,
+    NotificationType.BOOKING_CONFIRMATION
+)
 
 def generate_notification_message(type: NotificationType, booking: Booking) -> str:
     """
     Generate notification message based on type and booking details with WIB timezone (+7)
     """
-    # Convert UTC string to datetime and add 7 hours
-    start_time = start_time = booking.start_datetime + timedelta(hours=7)
+    # Bookings are no longer re-read from the database, so convert whatever
+    # offset the client sent instead of assuming UTC
+    start_time = as_aware(booking.start_datetime).astimezone(LOCAL_TIMEZONE)
     
     messages = {
         NotificationType.BOOKING_REMINDER: (
@@ -39,79 +42,76 @@ def generate_notification_message(type: NotificationType, booking: Booking) -> s
         NotificationType.PARTNER_UNAVAILABLE: (
             f"Unfortunately, {booking.partner.full_name} is no longer available for your "
             f"appointment on {start_time.strftime('%Y-%m-%d %H:%M')} WIB"
+        ),
+        NotificationType.BOOKING_COMPLETED: (
+            f"Your appointment with {booking.partner.full_name} on "
+            f"{start_time.strftime('%Y-%m-%d')} is complete. "
+            f"Let us know how it went by leaving a review"
         )
     }
     return messages.get(type, "Notification about your booking")
 
-def create_notification(
+def enqueue_booking_notifications(
     db: Session,
-    customer_id: int,
-    type: NotificationType,
-    booking_id: int,
-    scheduled_for: datetime
-) -> Notification:
+    bookings: Sequence[Booking],
+    types: Iterable[NotificationType] = BOOKING_NOTIFICATIONS
+) -> None:
     """
-    Create a new notification in the database.
-    
-    Args:
-        db: Database session
-        customer_id: ID of the customer to notify
-        type: Type of notification from NotificationType enum
-        booking_id: ID of the related booking
-        scheduled_for: When the notification should be sent
-        
-    Returns:
-        Notification: The created notification object
+    Write the notifications of many bookings to the outbox with one bulk
+    insert. Runs inside the caller's transaction, so notifications commit or
+    roll back together with their bookings; the caller commits.
     """
-    try:
-        # Get the booking to generate the message
-        booking = db.query(Booking).filter(Booking.id == booking_id).first()
-        if not booking:
-            raise ValueError(f"Booking with id {booking_id} not found")
-            
-        # Generate message based on notification type and booking details
-        message = generate_notification_message(type, booking)
-        
-        # Create notification object
-        notification = Notification(
-            customer_id=customer_id,
-            booking_id=booking_id,
-            type=type,
-            message=message,
-            scheduled_for=scheduled_for,
-            is_read=False
-        )
-        
-        db.add(notification)
-        db.commit()
-        db.refresh(notification)
-        
-        return notification
-        
-    except Exception as e:
-        db.rollback()
-        raise Exception(f"Failed to create notification: {str(e)}")
+    now = datetime.now(timezone.utc)
+    reminder = timedelta(minutes=settings.NOTIFICATION_REMINDER)
+    rows = [
+        {
+            "customer_id": booking.customer_id,
+            "booking_id": booking.id,
+            "type": type,
+            "message": generate_notification_message(type, booking),
+            "scheduled_for": (
+                booking.start_datetime - reminder
+                if type == NotificationType.BOOKING_REMINDER else now
+            )
+        }
+        for booking in bookings
+        for type in types
+    ]
+    if rows:
+        db.execute(insert(NotificationOutbox), rows)
 
-def schedule_booking_notifications(
-    db: Session,
-    booking: Booking
-) -> None:
-    """Schedule all necessary notifications for a booking"""
-    # Reminder 30 minutes before
-    reminder_time = booking.start_datetime - timedelta(minutes=30)
-    create_notification(
-        db,
-        customer_id=booking.customer_id,
-        type=NotificationType.BOOKING_REMINDER,
-        booking_id=booking.id,
-        scheduled_for=reminder_time
-    )
-    
-    # Booking confirmation
-    create_notification(
-        db,
-        customer_id=booking.customer_id,
-        type=NotificationType.BOOKING_CONFIRMATION,
-        booking_id=booking.id,
-        scheduled_for=datetime.now()
-    )
\ No newline at end of file
+def discard_pending_notifications(db: Session, booking_id: int) -> None:
+    """Drop the undelivered notifications of a cancelled booking. The caller commits."""
+    db.execute(delete(NotificationOutbox).where(NotificationOutbox.booking_id == booking_id))
+
+def dispatch_due_notifications(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Deliver one batch of due outbox rows to notifications and delete them
+    from the outbox. Rows locked by another dispatcher are skipped. The
+    caller commits.
+    """
+    due_ids = db.execute(
+        select(NotificationOutbox.id).where(
+            NotificationOutbox.scheduled_for <= datetime.now(timezone.utc)
+        ).order_by(
+            NotificationOutbox.scheduled_for
+        ).limit(
+            batch_size or settings.NOTIFICATION_DISPATCH_BATCH
+        ).with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not due_ids:
+        return 0
+
+    db.execute(insert(Notification).from_select(
+        ["customer_id", "booking_id", "type", "message", "scheduled_for", "is_read"],
+        select(
+            NotificationOutbox.customer_id,
+            NotificationOutbox.booking_id,
+            NotificationOutbox.type,
+            NotificationOutbox.message,
+            NotificationOutbox.scheduled_for,
+            literal(False)
+        ).where(NotificationOutbox.id.in_(due_ids))
+    ))
+    db.execute(delete(NotificationOutbox).where(NotificationOutbox.id.in_(due_ids)))
+    return len(due_ids)
@@ -0,0 +1,59 @@
+# src/utils/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just after (sort_value, row_id)"""
+    payload = json.dumps([sort_value.isoformat(), row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def keyset_page(
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True
+) -> Tuple[List, Optional[str]]:
+    """
+    One page of query ordered by (sort_column, id_column), starting after
+    the cursor. Seeks through the index instead of skipping rows, so deep
+    pages cost the same as the first one. Returns the rows and the cursor
+    of the next page, None on the last page.
+    """
+    key = tuple_(sort_column, id_column)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        query = query.filter(key < after if descending else key > after)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    return split_page(query.limit(limit + 1).all(), limit, sort_column.key, id_column.key)
+
+def split_page(
+    rows: List,
+    limit: int,
+    sort_attribute: str,
+    id_attribute: str = "id"
+) -> Tuple[List, Optional[str]]:
+    """Cut limit + 1 fetched rows down to a page and the cursor of the next one"""
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(
+        getattr(last, sort_attribute),
+        getattr(last, id_attribute)
+    )
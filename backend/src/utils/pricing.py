@@ -0,0 +1,75 @@
+# src/utils/pricing.py
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.models.partner import Partner
+from src.schemas.enums import BookingType
+from src.schemas.partner import PartnerPricing
+from src.config.settings import settings
+
+# partner_id -> (version, validated pricing), least recently used first
+_pricing_cache: "OrderedDict[int, Tuple[int, PartnerPricing]]" = OrderedDict()
+
+def _remember(partner_id: int, version: int, pricing: PartnerPricing) -> None:
+    _pricing_cache[partner_id] = (version, pricing)
+    _pricing_cache.move_to_end(partner_id)
+    while len(_pricing_cache) > settings.PRICING_CACHE_SIZE:
+        _pricing_cache.popitem(last=False)
+
+def price_booking(
+    pricing: PartnerPricing,
+    booking_type: BookingType,
+    start_datetime: datetime,
+    end_datetime: datetime
+) -> float:
+    """Price of [start_datetime, end_datetime) at the partner's rate for the booking type"""
+    duration = end_datetime - start_datetime
+
+    if booking_type == BookingType.HOURLY:
+        hours = duration.total_seconds() / 3600
+        return hours * pricing.hourly_rate
+    elif booking_type == BookingType.DAILY:
+        days = duration.days + (duration.seconds / 86400)
+        return days * pricing.daily_rate
+    else:  # MONTHLY
+        months = duration.days / 30
+        return months * pricing.monthly_rate
+
+def load_partner_pricing(
+    db: Session,
+    partner_ids: Sequence[int],
+    available_only: bool = False
+) -> Dict[int, PartnerPricing]:
+    """
+    Pricing of many partners. The first query reads only partner versions;
+    the pricing JSON is fetched and validated just for partners missing from
+    the cache or changed since. Unknown partners are left out of the result.
+    """
+    query = select(Partner.id, Partner.version).where(
+        Partner.id.in_(set(partner_ids))
+    )
+    if available_only:
+        query = query.where(Partner.is_available == True)
+
+    result = {}
+    stale = []
+    for partner_id, version in db.execute(query):
+        cached = _pricing_cache.get(partner_id)
+        if cached is None or cached[0] != version:
+            stale.append(partner_id)
+        else:
+            _pricing_cache.move_to_end(partner_id)
+            result[partner_id] = cached[1]
+
+    if stale:
+        for partner_id, version, pricing in db.execute(
+            select(Partner.id, Partner.version, Partner.pricing).where(Partner.id.in_(stale))
+        ):
+            result[partner_id] = PartnerPricing.model_validate(pricing)
+            _remember(partner_id, version, result[partner_id])
+    return result
+
+def get_partner_pricing(db: Session, partner_id: int) -> Optional[PartnerPricing]:
+    return load_partner_pricing(db, [partner_id]).get(partner_id)
@@ -0,0 +1,143 @@
+# src/utils/recurrence.py
+import time as clock
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.models.partner_availability_rule import PartnerAvailabilityRule
+from src.config.settings import settings
+from .timeline import Interval, as_aware
+
+LOCAL_TIMEZONE = timezone(timedelta(hours=settings.LOCAL_UTC_OFFSET))
+
+class RuleSpec(NamedTuple):
+    """Hashable snapshot of a PartnerAvailabilityRule, used as a cache key"""
+    partner_id: int
+    weekdays: Tuple[int, ...]
+    start_time: time
+    end_time: time
+    is_blocked: bool
+    valid_from: Optional[date]
+    valid_until: Optional[date]
+    exceptions: Tuple[date, ...]
+
+    @classmethod
+    def from_rule(cls, rule: PartnerAvailabilityRule) -> "RuleSpec":
+        return cls(
+            partner_id=rule.partner_id,
+            weekdays=tuple(sorted(rule.weekdays or [])),
+            start_time=rule.start_time,
+            end_time=rule.end_time,
+            is_blocked=rule.is_blocked,
+            valid_from=rule.valid_from,
+            valid_until=rule.valid_until,
+            exceptions=tuple(sorted(date.fromisoformat(d) for d in rule.exceptions or []))
+        )
+
+@lru_cache(maxsize=8192)
+def _expand_week(spec: RuleSpec, week_start: date) -> Tuple[Interval, ...]:
+    """Concrete intervals of one rule for the week starting on week_start (a Monday)"""
+    intervals = []
+    for offset in range(7):
+        day = week_start + timedelta(days=offset)
+        if day.weekday() not in spec.weekdays or day in spec.exceptions:
+            continue
+        if spec.valid_from and day < spec.valid_from:
+            continue
+        if spec.valid_until and day > spec.valid_until:
+            continue
+        start = datetime.combine(day, spec.start_time, LOCAL_TIMEZONE)
+        end = datetime.combine(day, spec.end_time, LOCAL_TIMEZONE)
+        if end <= start:  # Overnight window
+            end += timedelta(days=1)
+        intervals.append((start, end))
+    return tuple(intervals)
+
+def expand_rule(spec: RuleSpec, start: datetime, end: datetime) -> List[Interval]:
+    """Intervals of a rule overlapping [start, end), built week by week from the cache"""
+    start, end = as_aware(start), as_aware(end)
+    # Start a day early so overnight windows from the previous day are included
+    first_day = start.astimezone(LOCAL_TIMEZONE).date() - timedelta(days=1)
+    last_day = end.astimezone(LOCAL_TIMEZONE).date()
+    week_start = first_day - timedelta(days=first_day.weekday())
+
+    intervals = []
+    while week_start <= last_day:
+        intervals.extend(
+            (s, e) for s, e in _expand_week(spec, week_start)
+            if s < end and e > start
+        )
+        week_start += timedelta(days=7)
+    return intervals
+
+def weekly_occurrences(
+    start: datetime,
+    end: datetime,
+    count: int,
+    every_weeks: int = 1
+) -> List[Interval]:
+    """[start, end) and its next count - 1 repetitions, every_weeks apart"""
+    step = timedelta(weeks=every_weeks)
+    return [(start + i * step, end + i * step) for i in range(count)]
+
+# partner_id -> (loaded_at, rules)
+_rules_cache: Dict[int, Tuple[float, List[RuleSpec]]] = {}
+
+def load_partner_rules(
+    db: Session,
+    partner_ids: Iterable[int]
+) -> Dict[int, List[RuleSpec]]:
+    """
+    Rules of many partners, served from a short-lived in-process cache.
+    Partners missing from the cache are loaded with one query.
+    """
+    now = clock.monotonic()
+    ttl = settings.AVAILABILITY_RULE_CACHE_SECONDS
+    result: Dict[int, List[RuleSpec]] = {}
+    missing = []
+    for partner_id in partner_ids:
+        cached = _rules_cache.get(partner_id)
+        if cached and now - cached[0] < ttl:
+            result[partner_id] = cached[1]
+        else:
+            missing.append(partner_id)
+
+    if missing:
+        loaded = defaultdict(list)
+        rules = db.query(PartnerAvailabilityRule).filter(
+            PartnerAvailabilityRule.partner_id.in_(missing)
+        ).all()
+        for rule in rules:
+            loaded[rule.partner_id].append(RuleSpec.from_rule(rule))
+        for partner_id in missing:
+            result[partner_id] = loaded[partner_id]
+            _rules_cache[partner_id] = (now, loaded[partner_id])
+
+    return result
+
+def get_rule_blocked_intervals(
+    db: Session,
+    partner_ids: Sequence[int],
+    start: datetime,
+    end: datetime
+) -> Dict[int, List[Interval]]:
+    """Blocked intervals generated by recurring rules, per partner"""
+    blocked = defaultdict(list)
+    for partner_id, specs in load_partner_rules(db, partner_ids).items():
+        for spec in specs:
+            if spec.is_blocked:
+                blocked[partner_id].extend(expand_rule(spec, start, end))
+    for intervals in blocked.values():
+        intervals.sort()
+    return blocked
+
+def invalidate_partner_rules(partner_id: int) -> None:
+    _rules_cache.pop(partner_id, None)
+
+@event.listens_for(PartnerAvailabilityRule, "after_insert")
+@event.listens_for(PartnerAvailabilityRule, "after_update")
+@event.listens_for(PartnerAvailabilityRule, "after_delete")
+def _rule_changed(mapper, connection, target) -> None:
+    invalidate_partner_rules(target.partner_id)
@@ -0,0 +1,166 @@
+# src/utils/timeline.py
+import heapq
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
+from src.config.settings import settings
+
+Interval = Tuple[datetime, datetime]
+
+def get_break_duration() -> timedelta:
+    """Cooldown a partner needs between two bookings"""
+    return timedelta(hours=settings.BREAK_DURATION)
+
+def as_aware(value: datetime) -> datetime:
+    """Attach the local timezone to naive datetimes, leave aware ones alone"""
+    return value if value.tzinfo is not None else value.astimezone()
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort intervals and merge the ones that overlap or touch"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+class BusyTimeline:
+    """
+    Sorted, non-overlapping busy intervals of a single partner.
+
+    Bookings are widened by the break duration on both sides, so a slot is
+    free exactly when it does not overlap any interval on the timeline.
+    """
+
+    def __init__(self, intervals: Iterable[Interval]):
+        merged = merge_intervals(
+            (as_aware(start), as_aware(end)) for start, end in intervals
+        )
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    @classmethod
+    def from_bookings(
+        cls,
+        bookings: Iterable,
+        blocked_slots: Iterable = (),
+        cooldown: Optional[timedelta] = None,
+        blocked_intervals: Iterable[Interval] = ()
+    ) -> "BusyTimeline":
+        """
+        Build a timeline from Booking and blocked PartnerAvailability rows,
+        plus already expanded blocked intervals
+        """
+        if cooldown is None:
+            cooldown = get_break_duration()
+        intervals = [
+            (b.start_datetime - cooldown, b.end_datetime + cooldown)
+            for b in bookings
+        ]
+        intervals.extend((s.start_time, s.end_time) for s in blocked_slots)
+        intervals.extend(blocked_intervals)
+        return cls(intervals)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """Check whether [start, end) does not touch any busy interval"""
+        start, end = as_aware(start), as_aware(end)
+        index = bisect_right(self.ends, start)
+        return index == len(self.starts) or self.starts[index] >= end
+
+    def free_slots(
+        self,
+        start: datetime,
+        end: datetime,
+        next_slot: Callable[[datetime], Tuple[datetime, datetime]]
+    ) -> Iterator[Interval]:
+        """
+        Yield every free candidate slot starting in [start, end).
+
+        next_slot(current) returns (slot_end, next_current). Candidates must
+        come out in increasing order, which lets a single pointer walk the
+        timeline alongside them.
+        """
+        current = as_aware(start)
+        end = as_aware(end)
+        index = bisect_right(self.ends, current)
+        total = len(self.starts)
+
+        while current < end:
+            slot_end, following = next_slot(current)
+            while index < total and self.ends[index] <= current:
+                index += 1
+            if index == total or self.starts[index] >= slot_end:
+                yield current, slot_end
+            current = following
+
+    def gaps(self, start: datetime, end: datetime) -> Iterator[Interval]:
+        """Yield the free intervals between start and end"""
+        current = as_aware(start)
+        end = as_aware(end)
+        index = bisect_right(self.ends, current)
+
+        while current < end and index < len(self.starts):
+            busy_start = self.starts[index]
+            if busy_start >= end:
+                break
+            if busy_start > current:
+                yield current, busy_start
+            current = max(current, self.ends[index])
+            index += 1
+
+        if current < end:
+            yield current, end
+
+def earliest_fits(
+    timelines: Mapping[int, BusyTimeline],
+    start: datetime,
+    end: datetime,
+    length: timedelta,
+    align: Callable[[datetime], datetime]
+) -> Iterator[Tuple[datetime, int]]:
+    """
+    Yield (slot_start, partner_id) for the first slot of the given length
+    each partner can take, earliest first, with the slot starting in
+    [start, end).
+
+    align(value) returns the first allowed slot start at or after value and
+    must be monotonic. All partners' free gaps are k-way merged through one
+    heap keyed by the earliest slot each gap could hold, so a partner's
+    timeline is only walked as far as the global search front.
+    """
+    start, end = as_aware(start), as_aware(end)
+
+    def next_entry(partner_id: int, partner_gaps: Iterator[Interval]):
+        """Heap entry for the partner's next gap, None once past the search end"""
+        for gap_start, gap_end in partner_gaps:
+            candidate = align(gap_start)
+            if candidate < end:
+                return candidate, partner_id, gap_end, partner_gaps
+            return None
+        return None
+
+    heap = [
+        entry for entry in (
+            next_entry(partner_id, timeline.gaps(start, end + length))
+            for partner_id, timeline in timelines.items()
+        )
+        if entry is not None
+    ]
+    heapq.heapify(heap)
+
+    while heap:
+        candidate, partner_id, gap_end, partner_gaps = heapq.heappop(heap)
+        if candidate + length <= gap_end:
+            yield candidate, partner_id
+            continue
+        # The slot does not fit in this gap, so move the partner to its next one
+        entry = next_entry(partner_id, partner_gaps)
+        if entry is not None:
+            heapq.heappush(heap, entry)
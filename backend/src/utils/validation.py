@@ -1,47 +1,31 @@
 # src/utils/validation.py
-from datetime import datetime, timedelta
-from typing import Tuple, Optional
+from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
-from src.models.partner import Partner
-from src.models.booking import Booking
-from src.schemas.booking import BookingStatus
-from src.config.settings import settings
-from .scheduler import has_required_break  
+from sqlalchemy.exc import IntegrityError
+from src.models.booking import BOOKING_OVERLAP_CONSTRAINT
+from .conflicts import check_partner_conflicts
 
-def validate_partner_availability(
+def is_booking_conflict(error: IntegrityError) -> bool:
+    """Check whether a write was rejected by the booking overlap constraint"""
+    return BOOKING_OVERLAP_CONSTRAINT in str(error.orig)
+
+def describe_booking_conflict(
     db: Session,
     partner_id: int,
     start_datetime: datetime,
     end_datetime: datetime,
     exclude_booking_id: Optional[int] = None
-) -> Tuple[bool, str]:
+) -> str:
     """
-    Comprehensive validation for partner availability
+    Explain why the overlap constraint rejected a booking. Only runs on the
+    failure path, so successful bookings never pay for this query.
     """
-    # Check if partner exists and is available
-    partner = db.query(Partner).filter(
-        Partner.id == partner_id,
-        Partner.is_available == True
-    ).first()
-    
-    if not partner:
-        return False, "Partner not found or unavailable"
-    # Check existing bookings
-    query = db.query(Booking).filter(
-        Booking.partner_id == partner_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-        ~((Booking.end_datetime <= start_datetime) | 
-          (Booking.start_datetime >= end_datetime))
+    check = check_partner_conflicts(
+        db,
+        partner_id,
+        start_datetime,
+        end_datetime,
+        exclude_booking_id
     )
-    
-    if exclude_booking_id:
-        query = query.filter(Booking.id != exclude_booking_id)
-    
-    if query.first():
-        return False, "Time slot already booked"
-    
-    # Check break time
-    if not has_required_break(db, partner_id, start_datetime, end_datetime):
-        return False, "Must allow 1-hour break between bookings"
-    
-    return True, ""
+    return check.message or "Time slot already booked"
@@ -13,12 +13,14 @@ export function usePartners(kecamatan: string, filters: PartnerFilter) {
     const fetchPartners = async () => {
       try {
         setLoading(true)
-        const queryParams = new URLSearchParams({
-          kecamatan,
-          ...Object.fromEntries(
-            Object.entries(filters).filter(([_, v]) => v !== undefined)
-          ),
-        })
+        const queryParams = new URLSearchParams({ kecamatan })
+        Object.entries(filters)
+          .filter(([_, v]) => v !== undefined)
+          .forEach(([key, value]) => {
+            // Lists are sent as repeated parameters
+            const values = Array.isArray(value) ? value : [value]
+            values.forEach((v) => queryParams.append(key, String(v)))
+          })
 
         const response = await axiosClient.get(
           `/partners/search?${queryParams}`
@@ -12,6 +12,7 @@ export enum BookingType {
 }
 
 export enum MatchSortCriteria {
+  SCORE = 'score',
   RATING = 'rating',
   EXPERIENCE = 'experience',
   PRICE = 'price',
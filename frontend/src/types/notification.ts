@@ -6,6 +6,7 @@ export enum NotificationType {
   SCHEDULE_CHANGE = 'schedule_change',
   BOOKING_CONFIRMATION = 'booking_confirmation',
   PARTNER_UNAVAILABLE = 'partner_unavailable',
+  BOOKING_COMPLETED = 'booking_completed',
 }
 
 export interface Notification {
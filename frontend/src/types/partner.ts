@@ -29,6 +29,8 @@ export interface MatchRequest {
     min_experience: number
     max_hourly_rate: number | null
     specialization: string | null
+    specializations?: string[]
+    specialization_match?: 'all' | 'any'
     kecamatan: string
   }
   sort_by: MatchSortCriteria
@@ -40,6 +42,8 @@ export interface PartnerFilter {
   min_experience?: number
   max_hourly_rate?: number
   specialization?: string
+  specializations?: string[]
+  specialization_match?: 'all' | 'any'
 }
 
 // src/types/partner.ts